@@ -0,0 +1,34 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# bruteParser time against the number of obj/endobj and xref/startxref
+# markers in a damaged file. Roughly linear growth is expected.
+# Usage: python benchmarks/bench_brute.py [max_markers]
+import sys, os, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import bruteParser
+
+def damaged(n):
+    ''' n good objects, n headers of broken objects and n stray endobj,
+        plus n/10 broken xref sections '''
+    pdf = ['%PDF-1.4\n']
+    for i in xrange(1, n+1):
+        pdf.append('%d 0 obj\n<< /Index %d >>\nendobj\n'%(i, i))
+        pdf.append('%d 0 obj\n<< /Broken ]\n'%(n+i))
+        pdf.append('stray endobj\n')
+        if i%10 == 0:
+            pdf.append('xref\n0 1\n0000000000 65535 f \ntrailer\n<< /Size ]\n')
+    pdf.append('xref\n0 1\n0000000000 65535 f \ntrailer\n<< /Size 1 >>\nstartxref\n0\n%%EOF\n')
+    return ''.join(pdf)
+
+if __name__ == '__main__':
+    top = len(sys.argv) > 1 and int(sys.argv[1]) or 4000
+    n = 250
+    while n <= top:
+        data = damaged(n)
+        start = time.time()
+        xml = bruteParser(data)
+        elapsed = time.time() - start
+        print "%6d markers %8.3f s %4d objects"%(n, elapsed, len(xml.xpath('//indirect_object')))
+        n *= 2
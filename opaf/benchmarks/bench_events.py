@@ -0,0 +1,50 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Triage a pdf ("does it have /JavaScript or /OpenAction?") with the
+# event parser and with the full xml tree. Time and peak memory.
+# Usage: python benchmarks/bench_events.py [objects]
+import sys, os, time, resource
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import normalParser, parseEvents, PDFHandler
+
+def synthetic(n):
+    ''' A pdf with n dictionaries, the last one has an /OpenAction '''
+    body = ['%PDF-1.4\n']
+    for i in xrange(1, n+1):
+        body.append('%d 0 obj\n<< /Type /Dummy /Index %d /Next %d 0 R /Kids [1 2 3 (four)] >>\nendobj\n'%(i, i, i+1))
+    body.append('%d 0 obj\n<< /Type /Catalog /OpenAction %d 0 R >>\nendobj\n'%(n+1, n))
+    body.append('xref\n0 1\n0000000000 65535 f \ntrailer\n<< /Size 1 >>\nstartxref\n0\n%%EOF\n')
+    return ''.join(body)
+
+class Triage(PDFHandler):
+    def __init__(self):
+        self.found = set()
+    def startEntry(self, key, span):
+        if key in ['JavaScript', 'OpenAction']:
+            self.found.add(key)
+
+def tree(data):
+    xml = normalParser(data)
+    return set([e.text for e in xml.xpath('//entry/name[1]') if e.text in ['JavaScript', 'OpenAction']])
+
+def events(data):
+    return parseEvents(data, Triage()).found
+
+def peak():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.0
+
+if __name__ == '__main__':
+    n = len(sys.argv) > 1 and int(sys.argv[1]) or 20000
+    data = synthetic(n)
+    #Each run is done in a fresh child so the peak memory is its own
+    for f in [events, tree]:
+        pid = os.fork()
+        if pid == 0:
+            base = peak()
+            start = time.time()
+            found = f(data)
+            print "%-8s %7.3f s  +%7.1f MB peak  %r"%(f.__name__, time.time()-start, peak()-base, sorted(found))
+            os._exit(0)
+        os.waitpid(pid, 0)
@@ -0,0 +1,51 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Lexing/parsing throughput with DEBUG logging turned on and off.
+# Usage: python benchmarks/bench_logging.py [objects]
+import sys, os, time, logging
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.lexer import PDFLexer
+from opaflib.parser import bruteParser
+import ply.lex as lex
+
+def synthetic(n):
+    ''' A pdf with n small objects, each one surrounded by comments '''
+    body = ['%PDF-1.4\n']
+    for i in xrange(1, n+1):
+        body.append('%% comment number %d before the object\n'%i)
+        body.append('%d 0 obj\n<< /Type /Dummy /Index %d /Next %d 0 R >>\nendobj\n'%(i, i, i+1))
+        body.append('%% comment number %d after the object\n'%i)
+    body.append('%%EOF\n')
+    return ''.join(body)
+
+def measure(f, data, repeat=3):
+    ''' Best wall time of repeat runs '''
+    best = None
+    for i in xrange(repeat):
+        start = time.time()
+        f(data)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def run(data):
+    lexer = PDFLexer()
+    lexer.build(debug=False, errorlog=lex.NullLogger())
+    root = logging.getLogger()
+    #DEBUG records go nowhere so only the formatting cost is measured
+    root.addHandler(logging.NullHandler())
+    mb = len(data)/(1024.0*1024.0)
+    for level in [logging.DEBUG, logging.WARNING]:
+        root.setLevel(level)
+        lexing = measure(lexer.lexify, data)
+        brute = measure(bruteParser, data, 1)
+        print "%-8s lexer %7.2f MB/s   bruteParser %7.2f MB/s"%(logging.getLevelName(level), mb/lexing, mb/brute)
+
+if __name__ == '__main__':
+    n = len(sys.argv) > 1 and int(sys.argv[1]) or 5000
+    data = synthetic(n)
+    print "%d objects, %d bytes"%(n, len(data))
+    run(data)
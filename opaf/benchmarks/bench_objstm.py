@@ -0,0 +1,42 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Expanding a decoded ObjStm: one parse per sliced object (the old way)
+# against parseObjStm, a single pass over the whole stream.
+# Usage: python benchmarks/bench_objstm.py [objects]
+import sys, os, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import ParserSession, parseObjStm
+
+def objstm(n):
+    ''' Decoded data and /First of an ObjStm with n small dictionaries '''
+    body = []
+    table = []
+    size = 0
+    for i in xrange(n):
+        obj = '<< /Type /Dummy /Index %d /Next %d 0 R /Kids [1 2 3 (four)] >>\n'%(i, i+1)
+        table.append('%d %d'%(i+1, size))
+        body.append(obj)
+        size += len(obj)
+    head = ' '.join(table) + '\n'
+    return head + ''.join(body), len(head)
+
+def sliced(data, first):
+    pointers = [int(x) for x in data[:first].split()]
+    pointers = dict([(pointers[i+1]+first,pointers[i]) for i in range(0,len(pointers),2) ])
+    positions = sorted(pointers.keys() + [len(data)])
+    session = ParserSession('object')
+    return [(pointers[positions[p]], session.parse(data[positions[p]:positions[p+1]]+" "))
+            for p in range(0,len(positions)-1)]
+
+if __name__ == '__main__':
+    top = len(sys.argv) > 1 and int(sys.argv[1]) or 32000
+    n = 1000
+    while n <= top:
+        data, first = objstm(n)
+        for f in [sliced, parseObjStm]:
+            start = time.time()
+            objects = f(data, first)
+            print "%-12s %6d objects %8.3f s"%(f.__name__, len(objects), time.time()-start)
+        n *= 4
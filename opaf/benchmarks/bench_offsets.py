@@ -0,0 +1,27 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# PDFPdf.getObjectAt for the offset of every object, as a xref walk
+# does. The time per lookup should stay flat as the file grows.
+# Usage: python benchmarks/bench_offsets.py [max_objects]
+import sys, os, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import normalParser
+from bench_parallel import synthetic
+
+if __name__ == '__main__':
+    top = len(sys.argv) > 1 and int(sys.argv[1]) or 64000
+    n = 1000
+    while n <= top:
+        xml = normalParser(synthetic(n))
+        offsets = [io.span[0] for io in xml.xpath('//indirect_object')]
+        #The first lookup pays for building the index
+        start = time.time()
+        xml.getObjectAt(offsets[0])
+        first = time.time() - start
+        start = time.time()
+        found = len([pos for pos in offsets if xml.getObjectAt(pos).tag == 'indirect_object'])
+        elapsed = time.time() - start
+        print "%6d objects first %7.3f s, then %6.1f us/lookup %6d found"%(n, first, elapsed*1e6/len(offsets), found)
+        n *= 2
@@ -0,0 +1,38 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# normalParser against parallelParser with a growing number of jobs.
+# Usage: python benchmarks/bench_parallel.py [objects]
+import sys, os, time, multiprocessing
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import normalParser, parallelParser
+
+def synthetic(n):
+    ''' A pdf with n objects and a valid xref table '''
+    pdf = ['%PDF-1.4\n']
+    size = len(pdf[0])
+    offsets = []
+    for i in xrange(1, n+1):
+        offsets.append(size)
+        obj = '%d 0 obj\n<< /Type /Dummy /Index %d /Next %d 0 R /Kids [1 2 3 (four) /five] >>\nendobj\n'%(i, i, i+1)
+        pdf.append(obj)
+        size += len(obj)
+    pdf.append('xref\n0 %d\n0000000000 65535 f \n'%(n+1))
+    pdf += ['%010d 00000 n \n'%offset for offset in offsets]
+    pdf.append('trailer\n<< /Size %d >>\nstartxref\n%d\n%%%%EOF\n'%(n+1, size))
+    return ''.join(pdf)
+
+if __name__ == '__main__':
+    n = len(sys.argv) > 1 and int(sys.argv[1]) or 50000
+    data = synthetic(n)
+    print "%d objects, %d bytes, %d cpus"%(n, len(data), multiprocessing.cpu_count())
+    start = time.time()
+    expected = normalParser(data).xml
+    print "normalParser          %7.3f s"%(time.time()-start)
+    jobs = 1
+    while jobs <= multiprocessing.cpu_count():
+        start = time.time()
+        xml = parallelParser(data, jobs).xml
+        print "parallelParser %3d jobs %7.3f s %s"%(jobs, time.time()-start, xml == expected and 'same' or 'DIFFERENT')
+        jobs *= 2
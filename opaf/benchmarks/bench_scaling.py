@@ -0,0 +1,32 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Parsing time against size for big arrays, dictionaries and bodies.
+# A linear parser keeps the per element cost flat as the size doubles.
+# Usage: python benchmarks/bench_scaling.py [max_elements]
+import sys, os, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import parse
+
+def array(n):
+    return 'object', '[ %s ]'%' '.join([str(i) for i in xrange(n)])
+
+def dictionary(n):
+    return 'object', '<< %s >>'%' '.join(['/K%d %d'%(i, i) for i in xrange(n)])
+
+def body(n):
+    objs = ''.join(['%d 0 obj\n%d\nendobj\n'%(i, i) for i in xrange(1, n+1)])
+    return 'pdf', '%%PDF-1.4\n%sxref\n0 1\n0000000000 65535 f \ntrailer\n<< /Size 1 >>\nstartxref\n0\n%%%%EOF\n'%objs
+
+if __name__ == '__main__':
+    top = len(sys.argv) > 1 and int(sys.argv[1]) or 64000
+    for case in [array, dictionary, body]:
+        n = 1000
+        while n <= top:
+            tag, data = case(n)
+            start = time.time()
+            parse(tag, data)
+            elapsed = time.time() - start
+            print "%-10s %7d elements %8.3f s %6.2f us/element"%(case.__name__, n, elapsed, elapsed*1e6/n)
+            n *= 2
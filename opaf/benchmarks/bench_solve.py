@@ -0,0 +1,24 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Resolve every reference of a parsed pdf with PDFR.solve. Each object
+# points to the next one, so the time per reference should stay flat
+# as the file grows.
+# Usage: python benchmarks/bench_solve.py [max_objects]
+import sys, os, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import normalParser
+from bench_parallel import synthetic
+
+if __name__ == '__main__':
+    top = len(sys.argv) > 1 and int(sys.argv[1]) or 64000
+    n = 1000
+    while n <= top:
+        xml = normalParser(synthetic(n))
+        refs = xml.xpath('//R')
+        start = time.time()
+        found = len([r for r in refs if r.solve() is not None])
+        elapsed = time.time() - start
+        print "%6d objects %8.3f s %6.1f us/ref %6d solved"%(n, elapsed, elapsed*1e6/len(refs), found)
+        n *= 2
@@ -0,0 +1,36 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Cost of the span operations over every node of a parsed pdf: reading
+# them, moving the whole tree, expanding and clearing.
+# Usage: python benchmarks/bench_span_ops.py [objects]
+import sys, os, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import normalParser
+from bench_parallel import synthetic
+
+def read(xml):
+    for node in xml.iter():
+        node.span
+
+def move(xml):
+    xml.span_move(1000)
+
+def expand(xml):
+    for node in xml.iter():
+        node.span_expand((0, 1))
+
+def clear(xml):
+    xml.clear_span()
+
+if __name__ == '__main__':
+    n = len(sys.argv) > 1 and int(sys.argv[1]) or 20000
+    xml = normalParser(synthetic(n))
+    nodes = len(list(xml.iter()))
+    print "%d objects, %d nodes"%(n, nodes)
+    for f in [read, move, expand, clear]:
+        start = time.time()
+        f(xml)
+        elapsed = time.time() - start
+        print "%-8s %7.3f s %6.2f us/node"%(f.__name__, elapsed, elapsed*1e6/nodes)
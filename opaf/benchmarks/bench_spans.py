@@ -0,0 +1,31 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# normalParser with each span policy. Time, peak memory and size of
+# the serialized tree.
+# Usage: python benchmarks/bench_spans.py [objects]
+import sys, os, time, resource
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from opaflib.parser import normalParser, parsers
+from bench_parallel import synthetic
+
+def peak():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.0
+
+if __name__ == '__main__':
+    n = len(sys.argv) > 1 and int(sys.argv[1]) or 20000
+    data = synthetic(n)
+    parsers['pdf']
+    print "%d objects, %d bytes"%(n, len(data))
+    #Each run is done in a fresh child so the peak memory is its own
+    for spans in ['all', 'objects', 'none']:
+        pid = os.fork()
+        if pid == 0:
+            base = peak()
+            start = time.time()
+            xml = normalParser(data, spans=spans)
+            elapsed = time.time() - start
+            print "%-8s %7.3f s  +%7.1f MB peak  %9d bytes of xml"%(spans, elapsed, peak()-base, len(xml.xml))
+            os._exit(0)
+        os.waitpid(pid, 0)
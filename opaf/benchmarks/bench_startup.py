@@ -0,0 +1,37 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Cold start time of short lived runs: a fresh interpreter that imports
+# opaflib, parses one object and exits.
+# Usage: python benchmarks/bench_startup.py [runs]
+import sys, os, time, subprocess
+
+#Target for a whole cold run of opaf.py on a small file (seconds)
+TARGET = 0.125
+
+here = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+cases = [('import opaflib', ['-c', 'import opaflib']),
+         ("parse('object')", ['-c', "from opaflib.parser import parse; parse('object', '<< /A [1 2 0 R] >>')"]),
+         ('opaf.py mini.pdf', ['opaf.py', os.path.join('examples', 'mini.pdf')]),
+        ]
+
+def cold(args, runs):
+    ''' Best wall time of runs fresh interpreters '''
+    best = None
+    devnull = open(os.devnull, 'w')
+    for i in xrange(runs):
+        start = time.time()
+        subprocess.check_call([sys.executable] + args, cwd=here, stdout=devnull, stderr=devnull)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+if __name__ == '__main__':
+    runs = len(sys.argv) > 1 and int(sys.argv[1]) or 5
+    for name, args in cases:
+        elapsed = cold(args, runs)
+        print "%-20s %6.3f s"%(name, elapsed)
+    #Judged on the best of the opaf.py runs above, the last case
+    print "target %.3f s: %s"%(TARGET, elapsed <= TARGET and 'OK' or 'MISSED')
@@ -58,6 +58,9 @@ if __name__ == '__main__':
     parser.add_option("-l", "--logfile", dest="log_file", default='/dev/stdout',
                       help="Dump log messages to LOG file.", metavar="LOG")
 
+    parser.add_option("-v", "--verbose", action="store_true", dest="verbose", default=False,
+                      help="Log DEBUG messages too (slow).")
+
     parser.add_option("-i", "--interactive", action="store_true", dest="shell", default=False,
                       help="Throw interactive python shell")
 
@@ -73,6 +76,24 @@ if __name__ == '__main__':
     parser.add_option("-s", "--stats", action="store_false", dest="stats",
                       help="Dump some statistics to the log.")
 
+    parser.add_option("-m", "--mmap", action="store_true", dest="mmap", default=False,
+                      help="Memory map the input file instead of reading it.")
+
+    parser.add_option("-j", "--jobs", dest="jobs", type="int", default=1,
+                      help="Parse the objects with JOBS processes.", metavar="JOBS")
+
+    parser.add_option("--max-time", dest="max_time", type="float", default=None,
+                      help="Stop parsing after SECONDS, keep what was parsed.", metavar="SECONDS")
+
+    parser.add_option("--max-tokens", dest="max_tokens", type="int", default=None,
+                      help="Stop parsing after TOKENS tokens.", metavar="TOKENS")
+
+    parser.add_option("--max-nodes", dest="max_nodes", type="int", default=None,
+                      help="Stop parsing after NODES xml nodes.", metavar="NODES")
+
+    parser.add_option("--max-depth", dest="max_depth", type="int", default=None,
+                      help="Stop parsing at arrays/dictionaries nested deeper than DEPTH.", metavar="DEPTH")
+
     parser.add_option("-o", "--output_pdf", dest="output_pdf",
                       help="RE-Generate a pdf file.", metavar="PDF")
 
@@ -81,7 +102,7 @@ if __name__ == '__main__':
 
 
     (options, args) = parser.parse_args()
-    logging.basicConfig(filename=options.log_file,level=logging.DEBUG)
+    logging.basicConfig(filename=options.log_file,level=options.verbose and logging.DEBUG or logging.INFO)
     logger = logging.getLogger("OPAF")
     logger.debug("Starting OPAF")
     print options
@@ -90,7 +111,10 @@ if __name__ == '__main__':
         if len(args)>0 :
             filename=args[0]
             logger.info("Loading %s ..."%filename) 
-            pdf = file(filename,"rb").read()            
+            if options.mmap:
+                pdf = mapFile(filename)
+            else:
+                pdf = file(filename,"rb").read()            
         else:
             assert options.shell == False, "Interactive not compatible with stdin feed"
             pdf = sys.stdin.read()            
@@ -98,7 +122,12 @@ if __name__ == '__main__':
         if pdf:
             #parse
             logger.info("Parsing parsing parsing ...") 
-            xml_pdf = multiParser(pdf)
+            budget = None
+            if [options.max_time, options.max_tokens, options.max_nodes, options.max_depth] != [None]*4:
+                budget = Budget(options.max_time, options.max_tokens, options.max_nodes, options.max_depth)
+            xml_pdf = multiParser(pdf,jobs=options.jobs,budget=budget)
+            if budget is not None and budget.reason is not None:
+                logger.info("Parsing stopped, %s. The result is partial"%budget.reason)
 
         if options.decompress and xml_pdf:
             #A prepared script that flatten and fix the xml pdf.
@@ -1,10 +1,15 @@
-from opaflib.parser import parse,bruteParser,normalParser,xrefParser,multiParser
+from opaflib.parser import parse,bruteParser,normalParser,xrefParser,multiParser,parallelParser,mapFile,parseTokens,ParserSession,parseObjStm,parseEvents,PDFHandler,Budget
 from opaflib.xmlast import etree #payload,setpayload,xmlToPy,etree,create_node
 from opaflib.filters import defilterData
 from opaflib.xref import *
 #Logging facility
-import logging
-logging.basicConfig(filename='opaf.log',level=logging.DEBUG)
+#The library logs nothing unless the application configures logging.
+#Set OPAF_LOG=filename to get the old DEBUG dump of everything.
+import os,logging
+for name in ['LEXER', 'SCANNER', 'PARSER', 'OPAFXML', 'OPAFLib', 'OPAFXref']:
+    logging.getLogger(name).addHandler(logging.NullHandler())
+if os.environ.get('OPAF_LOG'):
+    logging.basicConfig(filename=os.environ['OPAF_LOG'],level=logging.DEBUG)
 logger = logging.getLogger("OPAFLib")
 
 #This file is poorly designed.
@@ -66,24 +71,16 @@ def expandObjStm(iostream):
     assert 'First' in dictionary.keys(), "First is mandatory in ObjStm dictionary"
     assert len(iostream) == 2, "It is already expanded, or SITW!"
     data = payload(iostream[1])
-    pointers =  [int(x) for x in data[:dictionary["First"]].split()]
-    assert len(pointers)%2 == 0 , "Wrong number of integer in the ObjStm begining"
-    pointers = dict([(pointers[i+1]+dictionary["First"],pointers[i]) for i in range(0,len(pointers),2) ])
-    positions = pointers.keys()
-    positions.sort()
-    positions.append(len(data))
     object_stream = etree.Element('object_stream', lexstart=iostream[1].get('lexstart'),
                                                    lexend=iostream[1].get('lexend'), 
                                                    payload="")
     iobjects = iostream.xpath('//*[starts-with(local-name(),"indirect_object")]')
 
-    for p in range(0,len(positions)-1):
-        logger.info("Adding new object %s from objectstream %s"%((pointers[positions[p]],0),payload(iostream)))
-        begin,end = (positions[p], positions[p+1])
-        xmlobject = parse('object', data[positions[p]:positions[p+1]]+" ")
+    for number, xmlobject in parseObjStm(data, dictionary["First"]):
+        logger.info("Adding new object %s from objectstream %s"%((number,0),payload(iostream)))
         io = etree.Element('indirect_object', lexstart=iostream[1].get('lexstart'),
                                               lexend=iostream[1].get('lexend'))
-        setpayload(io,repr((pointers[positions[p]],0)))
+        setpayload(io,repr((number,0)))
             
         io.append(xmlobject)
         object_stream.append(io)
@@ -778,7 +775,7 @@ def getObjectAt(xml_pdf, pos):
     '''
         Get the object found at certain byte position 
     '''
-    return xml_pdf.xpath('//*[starts-with(@span,"%d~")]'%pos)[0]
+    return xml_pdf.getObjectAt(pos)
 
 def getTrailer(xml_pdf):
     startxref = getStartXref(xml_pdf)
@@ -289,7 +289,10 @@ class FlateDecode(PDFFilter):
                 'Colors' : 1,
                 'BitsPerComponent': 8}        
     def __init__(self,params={}):
-        PDFFilter.__init__(self,self.default)
+        PDFFilter.__init__(self)
+        self.default = FlateDecode.default
+        #DecodeParms override the defaults (Predictor, Columns..)
+        self.setParams(params or {})
 
     def decode(self, data):
         p = self.getParams()
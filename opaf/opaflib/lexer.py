@@ -3,7 +3,8 @@
 ## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
 ####################################################################
 # PDF scanner/tokenizer
-import sys
+import sys,re
+from array import array
 import ply.lex as lex
 #logging facility
 import logging
@@ -31,8 +32,6 @@ class PDFLexer():
 
     #different lexers used..
     states = ( ('string', 'exclusive'),
-               ('name', 'exclusive'),
-               ('xref', 'exclusive'),
              )
 
     #7.2.2 Character Set
@@ -91,7 +90,7 @@ class PDFLexer():
     #(0Dh), a LINE FEED (0Ah), or both.
     @TOKEN(eol)
     def t_string_LITERAL_STRING_EOL(self, t):
-        t.lexer.string += '\x0A'
+        t.lexer.string.append('\x0A')
 
     #Nothing is ignored when lexing a string
     t_string_ignore = ''
@@ -106,41 +105,48 @@ class PDFLexer():
             value = chr(int(val[:2],8)) + val[3:]
         else:   
             value = { '\n': '', '\r': '', 'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', '(': '(', ')': ')', '\\': '\\' }[val[0]]
-        t.lexer.string += value
+        t.lexer.string.append(value)
 
     #PDF string insanity..
     def t_string_LEFT_PARENTHESIS(self, t):
         r'\('
         t.lexer.push_state('string')
-        t.lexer.string += '('
+        t.lexer.string.append('(')
         
     def t_string_RIGHT_PARENTHESIS(self, t):
         r'\)'
         t.lexer.pop_state()
         if t.lexer.current_state() == 'string':
-            t.lexer.string += ')'
+            t.lexer.string.append(')')
         else:
             t.type  = 'STRING'
-            t.value = t.lexer.string
+            t.value = ''.join(t.lexer.string)
             return t
-            
+
+    #Any run of characters with no special meaning is taken in one go.
+    #The string is kept as a list of chunks and joined at the end
+    def t_string_LITERAL_STRING_CHARS(self, t):
+        r'[^()\\\r\n]+'
+        t.lexer.string.append(t.value)
+
+    #A lone REVERSE SOLIDUS not starting a known escape sequence
     def t_string_LITERAL_STRING_CHAR(self, t):
         r'.'
-        t.lexer.string += t.value
+        t.lexer.string.append(t.value)
 
     #TODO: Log, increment a warning counter, or even dismiss the file   
     def t_string_error(self, t):
         logger.error('Error scanning a literal string at %d\n'%t.lexer.lexpos)
-        raise PDFLexer.Exception(self, t,'Scanning string')
+        raise PDFLexer.Exception(t,'Scanning string')
         t.type  = 'STRING'
-        t.value = t.lexer.string
+        t.value = ''.join(t.lexer.string)
         t.lexer.skip(1)
         return t
         
     def t_STRING(self, t):
         r'\('
         t.lexer.push_state('string')
-        t.lexer.string = ''
+        t.lexer.string = []
         
     #7.3.4.3    Hexadecimal Strings
     #Strings may also be written in hexadecimal form, which is useful for 
@@ -177,42 +183,14 @@ class PDFLexer():
     #c)  Any character that is not a regular character shall be written using
     #    its 2-digit hexadecimal code, preceded     by the NUMBER SIGN only.
 
+    #The whole name is taken in one match, #xx escapes are decoded after.
+    #endlexpos points one past the name like it always did.
+    @TOKEN(r'/(?:\#[0-9a-fA-F]{2}|[^'+white_spaces_r+delimiters_r+'])*')
     def t_NAME(self, t):
-        r'/'
-        t.lexer.push_state('name')    
-        t.lexer.name = ''
-        t.lexer.start = t.lexpos
-
-    def t_name_HEXCHAR(self, t):
-        r'\#[0-9a-fA-F]{2}'
-        #Beginning with PDF 1.2 a name object is an atomic symbol uniquely 
-        #defined by a sequence of any characters (8-bit values) except null (character code 0).
-        assert t.value != '#00'
-        t.lexer.name += t.value[1:].decode('hex')
-
-    @TOKEN(r'[^'+white_spaces_r+delimiters_r+']')
-    def t_name_NAMECHAR(self, t):
-        t.lexer.name += t.value
-        
-    @TOKEN(r'['+white_spaces_r+delimiters_r+']')
-    def t_name_WHITESPACE(self, t):
-    #    global stream_len
-        t.lexer.pop_state()
-        t.lexer.lexpos -= 1
-        t.lexpos = t.lexer.start
-        t.type  = 'NAME'
-        t.value = t.lexer.name
-        t.lexer.name=''
-        t.endlexpos = t.lexer.lexmatch.span(0)[1]
+        t.value = unescapeName(t.value[1:])
+        t.endlexpos = t.lexer.lexpos + 1
         return t
 
-    def t_name_error(self, t):
-        logger.error('Name error at pos: %d [%s]'%(t.lexer.lexpos, t.lexer.name))
-        raise PDFLexer.Exception(self, t,'Scanning a name')
-
-    #Nothing is ignored when lexing a name
-    t_name_ignore = ''
-
     #7.3.6 Array Objects
     #An array shall be written as a sequence of objects enclosed in [ and ].
     #EXAMPLE         [ 549 3.14 false ( Ralph ) /SomeName ]
@@ -234,15 +212,16 @@ class PDFLexer():
     #The keyword stream that follows the stream dictionary shall be followed by an 
     #end-of-line marker consisting of either a CARRIAGE RETURN and a LINE FEED or 
     #just a LINE FEED, and not by a CARRIAGE RETURN alone.
+    #In use_length mode the token is completed on the next call to token(),
+    #the parser has reduced the stream dictionary by then and left its
+    #direct /Length here, so the data is skipped instead of searched.
     def t_STREAM_DATA(self, t):
         r'stream(\r\n|\n)'
-        found = t.lexer.lexdata.find('endstream',t.lexer.lexpos)
-        if found != -1:
-            t.value = t.lexer.lexdata[t.lexer.lexpos: found]
-            t.lexer.lexpos = found + 9
-            t.type  = 'STREAM_DATA'
+        t.type  = 'STREAM_DATA'
+        if t.lexer.use_length:
+            t.lexer.pending_stream = t
         else:
-            raise Exception('Error:Parsing:Lexer: Could not found endstream string.')
+            endStream(t.lexer, t)
         return t
 
     #7.3.9 Null Object
@@ -294,43 +273,12 @@ class PDFLexer():
     #Each cross-reference section shall begin with a line containing the keyword
     #xref. Following this line shall be one or more cross-reference subsections,
     #which may appear in any order.
+    #The whole table is read in bulk by XrefTable.read, see below.
     @TOKEN(r'xref[' + white_spaces_r +']*'+eol)
     def t_XREF(self, t):
-        t.lexer.push_state('xref')    
-        t.lexer.xref = []
-        t.lexer.xref_start = t.lexpos
-        
-    def t_xref_XREFENTRY(self, t):
-        r'\d{10}[ ]\d{5}[ ][nf](\x20\x0D|\x20\x0A|\x0D\x0A)'
-        n = t.value.strip().split(' ')
-        t.lexer.xref[len(t.lexer.xref)-1][1].append((int(n[0],10), int(n[1],10), n[2]))
-
-    #EXAMPLE 1 The following line introduces a subsection containing five objects
-    #numbered consecutively from 28 to 32.
-    #          28 5
-    @TOKEN(r'[0-9]+[ ][0-9]+[' + white_spaces_r +']*'+eol)
-    def t_xref_SUBXREF(self, t):
-        n = t.value.split(' ')
-        t.lexer.xref.append(((int(n[0],10),int(n[1],10)),[]))
-        
-    def t_xref_out(self, t):
-        r'.'
-        t.lexer.pop_state()  
-        t.type = 'XREF'
-        t.value = t.lexer.xref
-        t.lexer.lexpos -= 1
-        t.lexpos=t.lexer.xref_start
+        t.value, t.lexer.lexpos = XrefTable.read(t.lexer.lexdata, t.lexer.lexpos)
         return t
 
-    #TODO: Log, increment a warning counter, or even dismiss the file   
-    def t_xref_error(self, t):
-        logger.error('Lexing XREF')
-        raise PDFLexer.Exception(t,'Scanning a normal XREF')
-
-    #Nothing is ignored when lexing an xref
-    t_xref_ignore = ''
-
-
     #7.5.5 File Trailer
     #The trailer of a PDF file enables a conforming reader to quickly find the
     #cross-reference table and certain special objects. Conforming readers 
@@ -368,7 +316,8 @@ class PDFLexer():
         if t.value.startswith('%%EOF'):
             t.type = 'EOF'
             return t
-        logger.debug("Ignoring comment <%s> at pos %d!!"%(t.value.encode('string_escape'), t.lexer.lexpos))
+        if t.lexer.log_comments:
+            logger.debug("Ignoring comment <%s> at pos %d!!", t.value.encode('string_escape'), t.lexer.lexpos)
 
     #Damn! A lexing error!!
     #TODO: Log, increment a warning counter, or even dismiss the file   
@@ -380,23 +329,150 @@ class PDFLexer():
     #ignore white spaces
     t_ignore = white_spaces
 
+    #The PLY master lexer, built once per class and cloned for each instance
+    _master = None
+
     def build(self, **kwargs):
-        self.lexer = lex.lex(object=self,**kwargs)
+        ''' Reflecting over the rules and compiling the master regular
+            expression is done only the first time. Later calls clone it
+            and bind the clone to this instance (kwargs are ignored then) '''
+        cls = self.__class__
+        if cls.__dict__.get('_master') is None:
+            cls._master = lex.lex(object=self,**kwargs)
+        self.lexer = cls._master.clone(self)
+        #Set by the parser: use /Length to skip the stream data
+        self.lexer.use_length = False
+        self.lexer.stream_length = None
+        self.lexer.pending_stream = None
+        self.lexer.log_comments = False
         return self.lexer
 
+    def token(self):
+        ''' Next token. Use this instead of the PLY lexer token() so a
+            pending STREAM_DATA (use_length mode) gets completed '''
+        if self.lexer.pending_stream is not None:
+            endStream(self.lexer, self.lexer.pending_stream)
+        return lex.Lexer.token(self.lexer)
+
     def __init__(self):
         self.lexer = None
 
-    def lexify(self,data):
-        ''' This translate a plain string into a sequence of tokens '''
+    def input(self,data):
+        ''' Feed the lexer. Strings and buffers (like a mmap) are scanned in
+            place, no copy of the data is made '''
+        #Forget any state left by a previous unterminated string
+        self.lexer.lexstatestack = []
+        self.lexer.begin('INITIAL')
+        self.lexer.stream_length = None
+        self.lexer.pending_stream = None
+        #Comments are the hot path, check the log level once per input
+        self.lexer.log_comments = logger.isEnabledFor(logging.DEBUG)
+        self.lexer.input(data)
+
+    def itertokens(self,data):
+        ''' Lazy version of lexify. Tokens are yielded one at a time so a
+            single pass over a big file keeps memory flat '''
         # Give the lexer some input
-        self.lexer.input(data+" ")
-        toks = []
+        self.input(data)
+        token = self.token
         while True:
-             tok = self.lexer.token()
+             tok = token()
              if not tok: break
-             toks.append(tok)
-        return toks
+             yield tok
+
+    def lexify(self,data):
+        ''' This translate a plain string (or a mmap) into a sequence of tokens '''
+        return list(self.itertokens(data))
+
+_endstream = re.compile('[%s]*endstream'%PDFLexer.white_spaces_r)
+def findEndstream(data, pos, stream, hint=None):
+    ''' Find the endstream keyword for the stream data starting at pos.
+        The stream keyword itself is at stream. hint is the pair
+        (end of the stream dictionary, direct /Length) left by the parser.
+        If the dictionary is right before the stream keyword the data is
+        skipped and only the endstream keyword is checked. Otherwise, or if
+        the check fails, endstream is searched '''
+    if hint is not None:
+        dictionary_end, length = hint
+        if length >= 0 and data[dictionary_end:stream].strip(PDFLexer.white_spaces) == '':
+            m = _endstream.match(data, pos+length)
+            if m:
+                return m.end()-9
+            logger.info("Stream at %d does not end at its /Length %d. Searching endstream", stream, length)
+    return data.find('endstream', pos)
+
+class XrefTable(object):
+    ''' A classic cross reference table read in bulk. Every subsection is
+        kept as (first object number, declared size, offsets, generations,
+        in use flags), the last three as compact arrays. str() gives back the
+        original text '''
+
+    #EXAMPLE 1 The following line introduces a subsection containing five objects
+    #numbered consecutively from 28 to 32.
+    #          28 5
+    subsection = re.compile(r'([0-9]+)[ ]([0-9]+)[' + PDFLexer.white_spaces_r +']*'+PDFLexer.eol)
+    #Each entry shall be exactly 20 bytes long, including the end-of-line marker.
+    #nnnnnnnnnn ggggg n eol
+    entries = re.compile(r'(?:\d{10}[ ]\d{5}[ ][nf](?:\x20\x0D|\x20\x0A|\x0D\x0A))*')
+    in_use = ''.join([chr(c == 'n') for c in map(chr, range(256))])
+
+    def __init__(self, raw, subsections):
+        self.raw = raw
+        self.subsections = subsections
+
+    @staticmethod
+    def read(data, pos=0):
+        ''' Read all the subsections found at pos. Returns the table and the
+            position where it ends '''
+        start = pos
+        subsections = []
+        while True:
+            m = XrefTable.subsection.match(data, pos)
+            if not m:
+                break
+            pos = XrefTable.entries.match(data, m.end()).end()
+            block = data[m.end():pos]
+            fields = block.split()
+            subsections.append((int(m.group(1), 10), int(m.group(2), 10),
+                                array('l', map(int, fields[0::3])),
+                                array('i', map(int, fields[1::3])),
+                                array('B', block[17::20].translate(XrefTable.in_use))))
+        return XrefTable(data[start:pos], subsections), pos
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        return 'XrefTable(%s)'%', '.join(['%d+%d'%(first, len(offsets)) for first, size, offsets, gens, used in self.subsections])
+
+    def __eq__(self, other):
+        return isinstance(other, XrefTable) and self.raw == other.raw
+
+    def __ne__(self, other):
+        return not self == other
+
+_name_hex = re.compile(r'\#([0-9a-fA-F]{2})')
+def _unhex(m):
+    #Beginning with PDF 1.2 a name object is an atomic symbol uniquely 
+    #defined by a sequence of any characters (8-bit values) except null (character code 0).
+    assert m.group(1) != '00'
+    return m.group(1).decode('hex')
+
+def unescapeName(name):
+    ''' Decode the #xx escapes of a name (without the SOLIDUS) '''
+    if '#' in name:
+        return _name_hex.sub(_unhex, name)
+    return name
+
+def endStream(lexer, t):
+    ''' Fill the STREAM_DATA token t and move the lexer past endstream '''
+    lexer.pending_stream = None
+    found = findEndstream(lexer.lexdata, lexer.lexpos, t.lexpos, lexer.stream_length)
+    lexer.stream_length = None
+    if found == -1:
+        raise Exception('Error:Parsing:Lexer: Could not found endstream string.')
+    t.value = lexer.lexdata[lexer.lexpos: found]
+    lexer.lexpos = found + 9
 
 if __name__ == '__main__':
     pdf_lexer = PDFLexer()
@@ -2,12 +2,14 @@
 ## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
 ## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
 ####################################################################
-import sys,re
+import sys,os,re,mmap,bisect,time,itertools,copy
 import traceback
 
 import ply.yacc as yacc
-from opaflib.lexer import PDFLexer 
-from opaflib.xmlast import create_leaf, create_tree
+import ply.lex as lex
+from opaflib.lexer import PDFLexer, XrefTable
+from opaflib.xmlast import create_leaf, create_tree, etree, PDF
+from opaflib.filters import defilterData
 
 
 #logging facility
@@ -17,15 +19,29 @@ logger = logging.getLogger("PARSER")
 # This is required by PLY
 tokens = PDFLexer.tokens
 
-tokens = PDFLexer.tokens
+#Span policy of the parse, see ParserSession. Inner nodes (values inside
+#an object and the stream data) keep their span only with spans='all',
+#file level nodes (header, objects, xref, startxref) also with 'objects'
+def _span(p, n, m=None):
+    if getattr(p.lexer, 'spans', 'all') != 'all':
+        return None
+    if m is None:
+        return p.lexspan(n)
+    return (p.lexspan(n)[0], p.lexspan(m)[1])
+
+def _objspan(p, n):
+    if getattr(p.lexer, 'spans', 'all') == 'none':
+        return None
+    return p.lexspan(n)
+
 #In PDF 1.5 and later, cross-reference streams may be used in 
 #linearized files in place of traditional cross-reference tables.
 #The logic described in this section, along with the appropriate 
 #syntactic changes for cross-reference streams shall still apply.
 def p_pdf(p):
     ''' pdf : HEADER pdf_update_list'''
-    header = create_leaf('header', p[1], span=p.lexspan(1))
-    p[0] = create_tree('pdf', [header] + p[2], span=p.lexspan(0), version="OPAF!" )
+    header = create_leaf('header', p[1], span=_objspan(p, 1))
+    p[0] = create_tree('pdf', [header] + p[2], span=_objspan(p, 0), version="OPAF!" )
 
 #7.3.6    Array Objects
 #An array object is a one-dimensional collection of objects arranged
@@ -36,11 +52,14 @@ def p_pdf(p):
 
 def p_array(p):
     ''' array : LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET '''
-    p[0] = create_tree('array', p[2], span=p.lexspan(0))
+    p[0] = create_tree('array', p[2], span=_span(p, 0))
 
+#List rules are left recursive and append in place. Each element costs
+#O(1) and the parser stack does not grow with the list
 def p_object_list(p):
-    ''' object_list : object object_list '''
-    p[0] = [p[1]] + p[2]
+    ''' object_list : object_list object '''
+    p[1].append(p[2])
+    p[0] = p[1]
 
 def p_object_list_empty(p):
     ''' object_list : '''
@@ -49,37 +68,37 @@ def p_object_list_empty(p):
 #Objects
 def p_object_name(p):
     ''' object : NAME '''
-    p[0] = create_leaf('name', p[1], span=p.lexspan(1))
+    p[0] = create_leaf('name', p[1], span=_span(p, 1))
 
 def p_object_string(p):
     ''' object : STRING '''                    
-    p[0] = create_leaf('string', p[1], span=p.lexspan(1))
+    p[0] = create_leaf('string', p[1], span=_span(p, 1))
     
 def p_object_hexstring(p):
     ''' object : HEXSTRING '''                    
-    p[0] = create_leaf('string', p[1], span=p.lexspan(1))
+    p[0] = create_leaf('string', p[1], span=_span(p, 1))
     
 def p_object_number(p):
     ''' object : NUMBER '''
     x = p[1]
     x = float(int(float(x))) == float(x) and int(float(x)) or float(x)
-    p[0] = create_leaf('number', x, span=p.lexspan(1))
+    p[0] = create_leaf('number', x, span=_span(p, 1))
     
 def p_object_true(p):
     ''' object : TRUE '''                    
-    p[0] = create_leaf('bool', True, span=p.lexspan(1))
+    p[0] = create_leaf('bool', True, span=_span(p, 1))
 
 def p_object_false(p):
     ''' object : FALSE '''                    
-    p[0] = create_leaf('bool', False, span=p.lexspan(1))
+    p[0] = create_leaf('bool', False, span=_span(p, 1))
 
 def p_object_null(p):
     ''' object : NULL '''                    
-    p[0] = create_leaf('null', None, span=p.lexspan(1))
+    p[0] = create_leaf('null', None, span=_span(p, 1))
     
 def p_object_ref(p):
     ''' object : R '''
-    p[0] = create_leaf('R', p[1], span=p.lexspan(1))
+    p[0] = create_leaf('R', p[1], span=_span(p, 1))
 
 #complex objexts
 def p_object_dictionary(p):
@@ -98,7 +117,16 @@ def p_object_array(p):
 #may have zero entries.
 def p_dictionary(p):
     ''' dictionary : DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN '''
-    p[0] = create_tree('dictionary', p[2], span=(p.lexspan(1)[0], p.lexspan(3)[1]))
+    p[0] = create_tree('dictionary', p[2], span=_span(p, 1, 3))
+    #The dictionary is reduced before the next token is read. If a stream
+    #follows, the lexer can use the direct /Length to skip its data
+    if getattr(p.lexer, 'use_length', False):
+        for entry in p[2]:
+            if entry[1].tag == 'number' and entry[0].value == 'Length':
+                #A real /Length is no hint, endstream is searched
+                length = entry[1].value
+                if type(length) in [int, long]:
+                    p.lexer.stream_length = (p.lexspan(3)[0]+2, length)
     
 def p_dictionary_entry_list(p):
     ''' dictionary_entry_list : dictionary_entry_list NAME object
@@ -106,10 +134,10 @@ def p_dictionary_entry_list(p):
     if len(p) == 1:
         p[0]=[]
     else:
-        key_node = create_leaf('name', p[2], span=p.lexspan(2))
-        dictionary_span = (p.lexspan(2)[0],p.lexspan(3)[1])
-        dictionary_node = create_tree('entry', [key_node,p[3]], span=dictionary_span)
-        p[0] = p[1] + [dictionary_node]
+        key_node = create_leaf('name', p[2], span=_span(p, 2))
+        dictionary_node = create_tree('entry', [key_node,p[3]], span=_span(p, 2, 3))
+        p[1].append(dictionary_node)
+        p[0] = p[1]
 
 
 #7.3.10 Indirect Objects
@@ -129,13 +157,13 @@ def p_indirect(p):
 def p_indirect_object(p):
     ''' indirect_object : OBJ object ENDOBJ '''
     ref = "%d %d"%p[1]
-    p[0] = create_tree('indirect_object', [p[2]], span=p.lexspan(0), id=ref)
+    p[0] = create_tree('indirect_object', [p[2]], span=_objspan(p, 0), id=ref)
     
 def p_indirect_object_stream(p):
     ''' indirect_object_stream : OBJ dictionary STREAM_DATA ENDOBJ '''
-    stream_data = create_leaf('data',p[3],span=(p.lexspan(2)[0],p.lexspan(4)[1]))
-    stream = create_tree('stream',[p[2], stream_data],span=p.lexspan(0))
-    p[0] =  create_tree('indirect_object', [stream],span=p.lexspan(0), id="%d %d"%p[1])
+    stream_data = create_leaf('data',p[3],span=_span(p, 2, 4))
+    stream = create_tree('stream',[p[2], stream_data],span=_span(p, 0))
+    p[0] =  create_tree('indirect_object', [stream],span=_objspan(p, 0), id="%d %d"%p[1])
 
 #pdf
 #7.5    File Structure
@@ -150,8 +178,8 @@ def p_indirect_object_stream(p):
 #     certain special objects within the body of the file
 def p_xref_common(p):
     ''' xref : XREF TRAILER dictionary '''
-    data = create_leaf('data', str(p[1]), span=p.lexspan(0))
-    p[0] = create_tree('xref',[p[3], data], span=p.lexspan(0))
+    data = create_leaf('data', str(p[1]), span=_span(p, 0))
+    p[0] = create_tree('xref',[p[3], data], span=_objspan(p, 0))
 
 # 7.5.8.1:: Therefore, with the exception of the startxref address %%EOF
 # segment and comments, a file may be entirely a sequence of objects.
@@ -162,17 +190,21 @@ def p_xref_stream(p):
 #PDF_UPDATE_LIST
 def p_pdf_update(p):
     ''' pdf_update : body xref pdf_end '''
+    if getattr(p.lexer, 'spans', 'all') == 'none':
+        p[0] = create_tree('pdf_update', p[1]+[p[2],p[3]], span=None)
+        return
     p[0] = create_tree('pdf_update', p[1]+[p[2],p[3]],span=(0xffffffff,-1))
     [p[0].span_expand(e.span) for e in p[1]+[p[2],p[3]]]
 
 #PDF_UPDATE_LIST
 def p_pdf_end(p):
     ''' pdf_end : STARTXREF EOF'''
-    p[0] = create_leaf('startxref', p[1], span=p.lexspan(0))
+    p[0] = create_leaf('startxref', p[1], span=_objspan(p, 0))
 
 def p_pdf_update_list(p):    
     ''' pdf_update_list : pdf_update_list pdf_update '''
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
 
 def p_pdf_update_list_one(p):    
     ''' pdf_update_list : pdf_update '''
@@ -181,12 +213,14 @@ def p_pdf_update_list_one(p):
 def p_body_object(p):
     ''' body : body indirect_object 
              | body indirect_object_stream '''
-    p[0] = p[1]+[p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
     
 def p_body_void(p):
     ''' body : '''
     p[0] = []
 
+#ParserSession counts the errors, see ParserSession.errors
 def p_error(p):
     if not p:
         logger.error("EOF reached!")
@@ -196,14 +230,13 @@ def p_error(p):
 #Used in BRUTE parsing
 def p_pdf_brute_end(p):
     ''' pdf_brute_end : XREF TRAILER  dictionary STARTXREF EOF'''
-    xref = create_tree('xref', [p[3]],span=(0,p.lexspan(4)[0]-1), xref=p[1])
+    xref = create_tree('xref', [p[3]],span=(p.lexspan(1)[0],p.lexspan(4)[0]-1), xref=p[1])
     pdf_end = create_leaf('startxref', p[4], span=(p.lexspan(4)[0],p.lexspan(0)[1]))
     p[0] = [xref, pdf_end] 
 
 
 # Build the parsers
-parsers = {}              
-starts = ['pdf','object', 'indirect', 'pdf_brute_end' ]
+starts = ['pdf','object', 'indirect', 'pdf_brute_end', 'xref', 'pdf_end' ]
 
 def generate_parsers():
     ''' 
@@ -212,41 +245,527 @@ def generate_parsers():
     '''
     for tag in starts:
         logger.info("Building parsing table for tag %s"%tag)
-        start = tag
-        yacc.yacc(start=tag, tabmodule='parsetab_%s'%tag, outputdir='opaflib')
+        yacc.yacc(start=tag, tabmodule='opaflib.parsetab_%s'%tag, outputdir=os.path.dirname(os.path.abspath(__file__)), debug=False)
+
+class ParserTable(dict):
+    ''' 
+        The parsers by start symbol. Each one is loaded from its 
+        precompiled table the first time it is used, so a run that only
+        needs 'object' never pays for 'pdf'. PLY checks the tables 
+        signature against the grammar and rebuilds them if they are stale.
+    '''
+    def __missing__(self, tag):
+        if tag not in starts:
+            raise KeyError(tag)
+        logger.info("Loading parsing table for tag %s"%tag)
+        self[tag] = yacc.yacc(start=tag, tabmodule='opaflib.parsetab_%s'%tag, write_tables=0, debug=False)
+        return self[tag]
+
+parsers = ParserTable()
+
+class BackendTable(dict):
+    '''
+        Lexer backend name -> lexer class. A backend given as a 
+        'module.Class' string is imported the first time it is used, so a
+        run that sticks to PLY never loads (nor compiles) the scanner.
+    '''
+    def __getitem__(self, name):
+        backend = dict.__getitem__(self, name)
+        if isinstance(backend, str):
+            module, _, attr = backend.rpartition('.')
+            backend = getattr(__import__(module, fromlist=[attr]), attr)
+            self[name] = backend
+        return backend
+
+#Available lexer backends. Both emit the same token stream
+backends = BackendTable({ 'ply': PDFLexer,
+                          'fast': 'opaflib.scanner.PDFScanner' })
 
-#Load the parsers
-for tag in starts:
-    logger.info("Building parsing table for tag %s"%tag)
-    start = tag
-    parsers[tag] = yacc.yacc(start=tag, tabmodule='opaflib.parsetab_%s'%tag, write_tables=0)
+class Budget(object):
+    '''
+       Resource caps for parsing hostile files: wall time in seconds,
+       tokens read, xml nodes created and << >>/[ ] nesting depth. None
+       means no cap. The clock starts when the budget is created, the
+       counters are shared by every parse it is given to. Once a cap is
+       hit reason says which one and any further parse stops right away
+       with Budget.Exceeded. normalParser, xrefParser and bruteParser
+       catch it and return what they got so far, marked as partial.
+    '''
+    class Exceeded(Exception):
+        pass
+
+    def __init__(self,seconds=None,tokens=None,nodes=None,depth=None):
+        self.seconds = seconds
+        self.tokens = tokens
+        self.nodes = nodes
+        self.depth = depth
+        self.deadline = seconds is not None and time.time()+seconds or None
+        self.first_node = PDF.nodes
+        self.used_tokens = 0
+        self.reason = None
+
+    def exceed(self, reason):
+        if self.reason is None:
+            logger.warning("Parsing budget exceeded: %s", reason)
+            self.reason = reason
+        raise Budget.Exceeded(self.reason)
+
+    def check(self):
+        ''' Raise Budget.Exceeded if out of time or nodes '''
+        if self.reason is not None:
+            self.exceed(self.reason)
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.exceed("more than %s seconds"%self.seconds)
+        if self.nodes is not None and PDF.nodes - self.first_node > self.nodes:
+            self.exceed("more than %d nodes"%self.nodes)
+
+    def watch(self, tokenfunc):
+        ''' 
+           Wrap a token function charging every token to the budget. Time
+           and nodes are checked on the first token and every 256 tokens.
+        '''
+        #Tokens read and nesting depth of this parse
+        state = [0, 0]
+        def token():
+            if not state[0] & 0xff:
+                self.check()
+            tok = tokenfunc()
+            if tok is None:
+                return None
+            state[0] += 1
+            self.used_tokens += 1
+            if self.tokens is not None and self.used_tokens > self.tokens:
+                self.exceed("more than %d tokens"%self.tokens)
+            nesting = _nesting.get(tok.type, 0)
+            if nesting:
+                state[1] += nesting
+                if self.depth is not None and state[1] > self.depth:
+                    self.exceed("nesting deeper than %d at %d"%(self.depth, tok.lexpos))
+            return tok
+        return token
+
+class ParserSession(object):
+    '''
+       One built lexer and parser reused for many parses of the same 
+       start symbol. Use it for lots of small parses, like the objects
+       of an ObjStm, instead of paying a new lexer on every parse() call.
+       spans selects which nodes get a span attribute: 'all' of them,
+       'objects' only the file level ones (header, indirect objects, xref
+       and startxref) or 'none', which also turns off PLY position
+       tracking. Use the cheaper ones when nothing maps back to offsets.
+       budget is an optional Budget charged with every token.
+    '''
+    class SyntaxError(Exception):
+        ''' Raised instead of PLY error recovery, pos is None at the end '''
+        def __init__(self, pos):
+            super(ParserSession.SyntaxError, self).__init__(pos is None and 'Unexpected end' or 'Syntax error at %d'%pos)
+            self.pos = pos
+
+    def __init__(self,tag,backend='ply',use_length=False,spans='all',budget=None):
+        assert spans in ['all', 'objects', 'none'], "Unknown span policy %s"%spans
+        self.tag = tag
+        #A copy sharing the tables, the error handler and the parser stacks
+        #(which _stackParts reads) belong to this session only
+        self.parser = copy.copy(parsers[tag])
+        self.parser.errorfunc = self._error
+        self.scanner = backends[backend]()
+        self.lexer = self.scanner.build(debug=False,errorlog=logger)
+        self.use_length = use_length
+        self.spans = spans
+        self.budget = budget
+        #Syntax errors of the last parse. PLY recovers and may still return a tree
+        self.errors = 0
+        #Raise ParserSession.SyntaxError instead of letting PLY recover
+        self.raise_errors = False
+
+    def parse(self,stream,start=0,stop=None,prefix=()):
+        '''
+           Parse stream from offset start, spans are offsets in stream.
+           With stop the input ends right after the first token of that 
+           type out of any << >> or [ ] (kept in self.last) or at the first
+           syntax error. prefix are tokens fed to the parser before the
+           ones lexed from stream.
+        '''
+        self.scanner.input(stream)
+        self.lexer.lexpos = start
+        self.lexer.use_length = self.use_length
+        self.lexer.spans = self.spans
+        self.last = None
+        self.depth = 0
+        self.errors = 0
+        tokenfunc = self.scanner.token
+        if prefix:
+            tokens = itertools.chain(prefix, iter(self.scanner.token, None))
+            tokenfunc = lambda: next(tokens, None)
+        if stop is not None:
+            token = tokenfunc
+            tokenfunc = lambda: self._until(stop, token)
+        if self.budget is not None:
+            tokenfunc = self.budget.watch(tokenfunc)
+        return self.parser.parse(tracking=self.spans != 'none',lexer=self.lexer,tokenfunc=tokenfunc)
 
+    def _error(self, p):
+        ''' PLY error function of this session '''
+        self.errors += 1
+        p_error(p)
+        if self.raise_errors:
+            raise ParserSession.SyntaxError(p is not None and p.lexpos or None)
 
-def parse(tag,stream):
+    def _until(self, stop, token):
+        if self.errors or (self.last is not None and self.last.type == stop and self.depth == 0):
+            return None
+        self.last = token()
+        if self.last is not None:
+            self.depth += _nesting.get(self.last.type, 0)
+        return self.last
+
+_nesting = { 'DOUBLE_LESS_THAN_SIGN': 1, 'LEFT_SQUARE_BRACKET': 1, 
+             'DOUBLE_GREATER_THAN_SIGN': -1, 'RIGHT_SQUARE_BRACKET': -1 }
+
+def parse(tag,stream,backend='ply',use_length=False,spans='all',budget=None):
     '''
        Entry function to parse a whole pdf or portion of it..
+       backend selects the lexer implementation (see backends)
+       use_length makes the lexer skip stream data using the direct /Length
+       of the stream dictionary, searching endstream only if that fails
+       spans selects the nodes that keep a span (see ParserSession)
+       budget caps the resources used, Budget.Exceeded is raised past it
     '''
-    logger.debug("Parsing an object of type <%s>"%tag)
-    lexer = PDFLexer().build(debug=False,errorlog=logger)
-    return parsers[tag].parse(stream,tracking=True,lexer=lexer)
+    logger.debug("Parsing an object of type <%s>", tag)
+    return ParserSession(tag,backend,use_length,spans,budget).parse(stream)
 
-def normalParser(pdf):
+def parseTokens(tag,tokens):
+    '''
+       Parse a pdf or portion of it from any iterable of tokens, for example
+       PDFLexer.itertokens(), instead of the parser driving its own lexer.
+    '''
+    logger.debug("Parsing an object of type <%s> from a token stream", tag)
+    tokens = iter(tokens)
+    return parsers[tag].parse(tracking=True, tokenfunc=lambda: next(tokens, None))
+
+def _token(ty, value, lexpos):
+    tok = lex.LexToken()
+    tok.type, tok.value, tok.lineno, tok.lexpos, tok.endlexpos = ty, value, 0, lexpos, lexpos+len(value)
+    return tok
+
+def parseObjStm(data,first,backend='ply'):
+    '''
+        Parse all the objects of a decoded object stream in one pass. The
+        objects past First are lexed in place and parsed as the elements
+        of a single array, then paired in offset order with the object
+        numbers of the table before First. Each one must begin where its
+        offset says, if any does not (or the pass fails) the objects are
+        parsed one by one from their offsets. Returns (number, xml) pairs 
+        in table order, spans are offsets in data.
+    '''
+    pointers = [int(x) for x in data[:first].split()]
+    assert len(pointers)%2 == 0 , "Wrong number of integer in the ObjStm begining"
+    numbers, starts = pointers[0::2], [first+offset for offset in pointers[1::2]]
+    order = sorted(range(len(numbers)), key=lambda i: starts[i])
+    session = ParserSession('object', backend)
+    session.scanner.input(data)
+    session.lexer.lexpos = first
+    tokens = itertools.chain([_token('LEFT_SQUARE_BRACKET', '[', first)],
+                             iter(session.scanner.token, None),
+                             [_token('RIGHT_SQUARE_BRACKET', ']', len(data))])
+    try:
+        array = session.parser.parse(tracking=True, lexer=session.lexer, tokenfunc=lambda: next(tokens, None))
+    except PDFLexer.Exception:
+        array = None
+    if array is not None and not session.errors and len(array) == len(numbers):
+        #Offsets may point to the white space before an object
+        elements = list(array)
+        if all([_gap.match(data, starts[i]).end() == xml.span[0] for i, xml in zip(order, elements)]):
+            objects = [None]*len(numbers)
+            for i, xml in zip(order, elements):
+                objects[i] = (numbers[i], xml)
+            return objects
+    logger.info("The ObjStm objects do not match its table, parsing them one by one")
+    ends = dict(zip(order, [starts[i] for i in order[1:]] + [len(data)]))
+    objects = []
+    for i, number in enumerate(numbers):
+        xml = session.parse(data[starts[i]:ends[i]])
+        assert xml is not None and not session.errors, "Can not parse object %d of the ObjStm at %d"%(number, starts[i])
+        xml.span_move(starts[i])
+        objects.append((number, xml))
+    return objects
+
+class PDFHandler(object):
+    '''
+       Callbacks for parseEvents. Override the ones you need, the rest do
+       nothing. Spans are (start,end) file offsets, end excluded. Raise
+       from any callback to stop the parsing early.
+    '''
+    def startObject(self, ref, span): pass
+    def endObject(self, ref, span): pass
+    def startDictionary(self, span): pass
+    def endDictionary(self, span): pass
+    def startEntry(self, key, span): pass
+    def endEntry(self, key, span): pass
+    def startArray(self, span): pass
+    def endArray(self, span): pass
+    def reference(self, ref, span): pass
+    def stream(self, data, span): pass
+    def value(self, tag, value, span): pass
+
+#Whitespace and comments the lexer skips before a token
+_gap = re.compile(r'(?:[%s]+|%%[^\r\n]*[\r\n])*'%PDFLexer.white_spaces_r)
+
+def parseEvents(pdf,handler,backend='ply'):
+    '''
+       Walk the tokens of a pdf (or portion of it) reporting indirect 
+       objects, dictionaries and their entries, arrays, references, streams
+       and plain values to handler (see PDFHandler). No xml tree is built.
+       Only the object nesting is checked, not the whole grammar. Xref 
+       tables, trailers keywords and headers are skipped.
+       Returns the handler.
+    '''
+    scanner = backends[backend]()
+    lexer = scanner.build(debug=False,errorlog=logger)
+    scanner.input(pdf)
+    token = scanner.token
+    #Open containers: [kind, start, ref or key, key start]
+    stack = []
+    while True:
+        before = lexer.lexpos
+        tok = token()
+        if not tok:
+            break
+        ty = tok.type
+        start = tok.lexpos
+        end = lexer.lexpos
+        done = True
+        if ty == 'NAME':
+            top = stack and stack[-1]
+            if top and top[0] == 'dictionary' and top[2] is None:
+                top[2], top[3] = tok.value, start
+                handler.startEntry(tok.value, (start,end))
+                done = False
+            else:
+                handler.value('name', tok.value, (start,end))
+        elif ty == 'NUMBER':
+            x = tok.value
+            x = float(int(float(x))) == float(x) and int(float(x)) or float(x)
+            handler.value('number', x, (start,end))
+        elif ty == 'STRING':
+            #STRING tokens point to the closing parenthesis
+            start = _gap.match(pdf, before).end()
+            handler.value('string', tok.value, (start,end))
+        elif ty == 'HEXSTRING':
+            handler.value('string', tok.value, (start,end))
+        elif ty == 'R':
+            handler.reference(tok.value, (start,end))
+        elif ty == 'TRUE' or ty == 'FALSE':
+            handler.value('bool', ty == 'TRUE', (start,end))
+        elif ty == 'NULL':
+            handler.value('null', None, (start,end))
+        elif ty == 'DOUBLE_LESS_THAN_SIGN':
+            stack.append(['dictionary', start, None, None])
+            handler.startDictionary((start,end))
+            done = False
+        elif ty == 'DOUBLE_GREATER_THAN_SIGN':
+            assert stack and stack[-1][0] == 'dictionary' and stack[-1][2] is None, "Unexpected >> at %d"%start
+            handler.endDictionary((stack.pop()[1],end))
+        elif ty == 'LEFT_SQUARE_BRACKET':
+            stack.append(['array', start, None, None])
+            handler.startArray((start,end))
+            done = False
+        elif ty == 'RIGHT_SQUARE_BRACKET':
+            assert stack and stack[-1][0] == 'array', "Unexpected ] at %d"%start
+            handler.endArray((stack.pop()[1],end))
+        elif ty == 'OBJ':
+            assert not stack, "Unexpected obj at %d"%start
+            stack.append(['object', start, tok.value, None])
+            handler.startObject(tok.value, (start,end))
+            done = False
+        elif ty == 'STREAM_DATA':
+            assert stack and stack[-1][0] == 'object', "Unexpected stream at %d"%start
+            handler.stream(tok.value, (start,end))
+            done = False
+        elif ty == 'ENDOBJ':
+            assert stack and stack[-1][0] == 'object', "Unexpected endobj at %d"%start
+            _, ostart, ref, _ = stack.pop()
+            handler.endObject(ref, (ostart,end))
+            done = False
+        else:
+            done = False
+        #A complete value closes the pending dictionary entry
+        if done and stack and stack[-1][0] == 'dictionary' and stack[-1][2] is not None:
+            top = stack[-1]
+            handler.endEntry(top[2], (top[3],end))
+            top[2] = top[3] = None
+    return handler
+
+def mapFile(filename):
+    '''
+        Map a whole file read only in memory. The returned mmap can be passed
+        to any of the parsers in place of a string. Tokens, stream data and
+        the brute force slices are taken straight from the mapping so the
+        file is never copied as a whole. An empty file can not be mapped
+        and gives an empty string.
+    '''
+    f = open(filename, "rb")
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        f.close()
+
+def normalParser(pdf,backend='ply',use_length=False,spans='all',budget=None,recover=False):
     '''
         This will try to apply the grammar described here 
         http://feliam.wordpress.com/2010/08/22/pdf-sequential-parsing/
 
         Assuming endstreams are no appearing inside streams 
         we can apply an eager parser and do not Need the xref
+        If the budget runs out the objects parsed so far are returned
+        With recover a lexer or syntax error drops only the object it is
+        in, the parsing goes on at the next object or endobj. The ranges
+        dropped are listed in the errors attribute of the pdf node.
+    '''
+    session = ParserSession('pdf',backend,use_length,spans,budget)
+    keep = spans != 'none'
+    header = None
+    updates = []
+    body = []
+    errors = []
+    reason = None
+    prefix = ()
+    pos = 0
+    #PLY own error recovery would empty the stack, stop right there
+    session.raise_errors = recover
+    while True:
+        try:
+            xml = session.parse(pdf, pos, prefix=prefix)
+            if not errors:
+                return xml
+            body = _joinUpdates(body, xml[1:], updates, keep)
+            break
+        except (Budget.Exceeded, PDFLexer.Exception, ParserSession.SyntaxError), e:
+            if not recover and not isinstance(e, Budget.Exceeded):
+                raise
+            first, finished, objects, start = _stackParts(session, keep)
+            header = header if header is not None else first
+            if header is None:
+                if isinstance(e, Budget.Exceeded):
+                    return None
+                raise
+            body = _joinUpdates(body, finished, updates, keep) + objects
+            if isinstance(e, Budget.Exceeded):
+                reason = str(e)
+                break
+            #Resync at the next object header after the failed object (the
+            #error may be found far away, a stray ( eats up to the end) or
+            #right after the next endobj
+            at = e.pos is None and len(pdf) or e.pos
+            if start is None:
+                #No object in progress, the damage begins after the last one
+                start = keep and body and max(body[-1].span[1], pos) or at
+            ends = [m.start() for m in [_obj_header.search(pdf, start+1)] if m]
+            found = pdf.find('endobj', at)
+            if found >= 0:
+                ends.append(found+6)
+            pos = ends and min(ends) or len(pdf)
+            errors.append((start, pos))
+            logger.info("Error at %d, skipping %d~%d (%s)", at, start, pos, e)
+            if pos >= len(pdf):
+                break
+            prefix = [_token('HEADER', header.value, pos)]
+
+    if body:
+        updates.append(create_tree('pdf_update', body, span=keep and (0xffffffff,-1) or None))
+        if keep:
+            [updates[-1].span_expand(e.span) for e in body]
+    xml = create_tree('pdf', [header] + updates, span=keep and (0xffffffff,-1) or None, version="OPAF!")
+    if keep:
+        [xml.span_expand(e.span) for e in xml]
+    if reason is not None:
+        xml.set('partial', reason)
+    if errors:
+        xml.set('errors', ' '.join(['%d~%d'%error for error in errors]))
+    return xml
+
+def _joinUpdates(body, finished, updates, keep):
+    '''
+        Add the finished updates to updates, the first one starting with
+        the objects of body. Returns what is left of body.
+    '''
+    if not finished:
+        return body
+    for i, e in enumerate(body):
+        finished[0].insert(i, e)
+        if keep:
+            finished[0].span_expand(e.span)
+    updates += finished
+    return []
+
+def _stackParts(session, keep):
+    '''
+        What is left on the stack of an aborted pdf parse: the header, the
+        finished updates, the finished objects of the current update and 
+        the offset of the object in progress (or None).
     '''
-    return parse('pdf',pdf)
+    header = None
+    updates = []
+    body = []
+    start = None
+    stack = list(session.parser.symstack)
+    #An object may be complete but still waiting for a lookahead to be
+    #reduced, run its grammar action here
+    types = [sym.type for sym in stack[-4:]]
+    if types == ['body', 'OBJ', 'object', 'ENDOBJ']:
+        stack[-3:] = [_reduce(session, 'indirect_object', p_indirect_object, stack[-3:])]
+    elif types == ['OBJ', 'dictionary', 'STREAM_DATA', 'ENDOBJ'] and stack[-5].type == 'body':
+        stack[-4:] = [_reduce(session, 'indirect_object_stream', p_indirect_object_stream, stack[-4:])]
+    if stack[-1].type.startswith('indirect_object'):
+        stack[-2].value.append(stack.pop().value)
+    for sym in stack:
+        if sym.type == 'HEADER':
+            header = create_leaf('header', sym.value, span=keep and (sym.lexpos, sym.endlexpos) or None)
+        elif sym.type == 'pdf_update_list':
+            updates = sym.value
+        elif sym.type == 'body':
+            body = sym.value
+        elif sym.type == 'OBJ':
+            start = sym.lexpos
+    return header, updates, body, start
 
-def bruteParser(pdf):
+def _reduce(session, tag, action, symbols):
+    ''' A stack symbol made by running a grammar action on symbols '''
+    sym = yacc.YaccSymbol()
+    sym.type = tag
+    sym.lexpos = symbols[0].lexpos
+    sym.endlexpos = getattr(symbols[-1], 'endlexpos', symbols[-1].lexpos)
+    p = yacc.YaccProduction([sym] + symbols)
+    p.lexer = session.lexer
+    action(p)
+    return sym
+
+def _lostObjects(pdf, xml):
+    '''
+        The offsets of the object headers a recovered parse dropped: not 
+        inside any object it read nor at the start of a skipped range.
+    '''
+    spans = sorted([io.span for io in xml.iter('indirect_object')])
+    begins = [begin for begin, end in spans]
+    skipped = set([int(error.partition('~')[0]) for error in xml.get('errors', '').split()])
+    lost = []
+    for m in _obj_header.finditer(pdf):
+        i = bisect.bisect_right(begins, m.start()) - 1
+        if m.start() not in skipped and (i < 0 or spans[i][1] <= m.start()):
+            lost.append(m.start())
+    return lost
+
+def bruteParser(pdf,backend='ply',use_length=False,budget=None):
     '''
         This will try to parse any object in the file based on obj/endobj and few other kewords.
         This is an ad-hoc parsing wich will try to read the file in any posile way. 
         It may produce phantom overlaped XML objects. Yo may check this issues afterwards.
-        Also it is slow.
+        Also it is slow. If the budget runs out only the markers tried so far are used.
     '''
+    #Checked once, the candidate loops below are the hot path
+    debug = logger.isEnabledFor(logging.DEBUG)
     try:
         #Search for the PDF header
         headers = list(re.finditer(r'%PDF-1\.[0-7]',pdf))
@@ -259,83 +778,75 @@ def bruteParser(pdf):
         logger.info('Found %d headers'%len(xml_headers))
         
         #Search the startxref. And xrefs.
+        #Each marker is parsed once, straight from the file, up to the first
+        #%%EOF (or endobj) token. The end found must be one of the markers,
+        #looked up with bisect in their sorted offsets.
         startxrefs = list(re.finditer(r'startxref[\x20\r\n\t\x0c\x00]+[0-9]+[\x20\r\n\t\x0c\x00]+%%EOF',pdf))
+        startxref_starts = [x.start() for x in startxrefs]
+        startxref_ends = [x.end() for x in startxrefs]
         xrefs = list(re.finditer(r'xref',pdf))    
         xml_xrefs = []
         xml_pdf_ends = []
+        session = ParserSession('pdf_brute_end', backend, use_length, budget=budget)
         for xref in xrefs:
             start = xref.start()
-            for end in [x.end() for x in startxrefs if x.start()>xref.end()]:
-                logger.info("Searching for a xref, trailer and %%%%EOF at [%s:%s]"%(start,end))
-                potential_xref = pdf[start:end]
-                try:
-                    xml_xref, xml_pdf_end = parse('pdf_brute_end', potential_xref)
-                    #fix lexspan and append
-                    xml_xref.span_move(start)
-                    xml_xrefs.append(xml_xref)
-                    #fix lexspan and append
-                    xml_pdf_end.span_move(start)
-                    xml_pdf_ends.append(xml_pdf_end)
-                except Exception, e:
-                    print e
-                    logger.info("Couldn't parse a xref, trailer and %%%%EOF at [%s:%s] (%s)"%(start,end,e))
+            if bisect.bisect_right(startxref_starts, xref.end()) == len(startxrefs):
+                break
+            logger.info("Searching for a xref, trailer and %%%%EOF at %s", start)
+            try:
+                result = session.parse(pdf, start, 'EOF')
+            except Budget.Exceeded:
+                break
+            except Exception, e:
+                logger.info("Couldn't parse a xref, trailer and %%%%EOF at %s (%s)", start, e)
+                continue
+            if result is None or session.errors:
+                continue
+            end = session.last.lexpos+5
+            i = bisect.bisect_left(startxref_ends, end)
+            if i < len(startxref_ends) and startxref_ends[i] == end:
+                xml_xref, xml_pdf_end = result
+                xml_xrefs.append(xml_xref)
+                xml_pdf_ends.append(xml_pdf_end)
 
         #use the force
-        #This algorithm will try to match any obj with any endobj and will keep it 
-        #if a sane object is found inside. Overlapping is possible here, you may analize it
-        #cut it off from the xml later, using the lexspan markers.
+        #This algorithm will try to match any obj with the nearest endobj it can
+        #parse up to and will keep it if a sane object is found inside. Overlapping
+        #is possible here, you may analize it cut it off from the xml later, using
+        #the lexspan markers.
         delimiter = r"[()<>\[\]/%\x20\r\n\t\x0c\x00]"
         objs = list(re.finditer(r'\d+\x20\d+\x20obj'+delimiter, pdf))
         endobjs = list(re.finditer(delimiter+r'endobj', pdf))
-        streams = list(re.finditer(delimiter+'stream'+delimiter, pdf))
-        endstreams = list(re.finditer('endstream'+delimiter+'endobj', pdf))
+        endobj_starts = [x.start() for x in endobjs]
+        endobj_ends = [x.end() for x in endobjs]
         xml_iobjects = []
         logger.info("Found %d Object starting points"%len(objs))
         logger.info("Found %d Object ending points"%len(endobjs))
+        session = ParserSession('indirect', backend, use_length, budget=budget)
         for m in objs:
             start = m.start()
-            for end in [x.end() for x in endobjs if x.start()>m.end()]:
-                try:
-                    logger.debug("Parsing potential object at %s~%s"%(start,end))
-                    potential_obj = pdf[start:end]
-                    
-                    '''
-                    DISABLED
-                    # If for some reason there are "endstreams" keywords inside the 
-                    # stream let's momentaneaously escape them, so it can be parsed  
-                    # with the strict parser
-                    escape_endstreams = [e.start()+start for e in endstreams if e.start()>start and e.end()<end ]
-                    for e in escape_endstreams[:-1]:
-                        potential_obj = potential_obj[:e] +"X"*9 + potential_obj[e+9:]
-                    '''
-                    
-                    #Try to strictly parse an indirect object
-                    xml_iobject = parse('indirect',potential_obj)
-
-                    #fix lexspan
-                    xml_iobject.span_move(start)
-
-                    '''
-                    DISABLED
-                    #FIX: fix escape
-                    #WRONG offset!!!!!!!!!!!!
-                    pl = payload(xml_iobject)
-                    #Un-escape the "endstream" keywords
-                    for e in escape_endstreams[:-1]:
-                        pl = pl[:e] +"endstream" + pl[e+9:]
-                    setpayload(xml_iobject, pl)
-                    '''
-
-                    #append to the list
-                    xml_iobjects.append(xml_iobject)
-
-                    #Just parse the first object we can of this try.
-                    #Comment out the following line to search for phantoms 
-                    #(i.e. objects inside objects or overlaped objects)
-                    break
-                except Exception,e:
-                    logger.debug("Received exception %s when parsing potential object at [%s:%s]."%(e, start,end))
-        logger.info("Succesfully parsed %d/%d Objects ending points"%(len(xml_iobjects),len(endobjs)*len(objs)))
+            if bisect.bisect_right(endobj_starts, m.end()) == len(endobjs):
+                break
+            if debug:
+                logger.debug("Parsing potential object at %s", start)
+            try:
+                #Try to strictly parse an indirect object
+                xml_iobject = session.parse(pdf, start, 'ENDOBJ')
+            except Budget.Exceeded:
+                break
+            except Exception,e:
+                if debug:
+                    logger.debug("Received exception %s when parsing potential object at %s.", e, start)
+                continue
+            if xml_iobject is None or session.errors:
+                continue
+            end = session.last.lexpos+6
+            i = bisect.bisect_left(endobj_ends, end)
+            if i < len(endobj_ends) and endobj_ends[i] == end:
+                #Phantoms (objects inside objects or overlaped objects) are 
+                #kept, every obj marker is tried
+                xml_iobjects.append(xml_iobject)
+        logger.info("Succesfully parsed %d/%d Objects starting points"%(len(xml_iobjects),len(objs)))
 
         #sum all the objects
         allobjects = xml_headers + xml_xrefs + xml_pdf_ends + xml_iobjects
@@ -356,6 +867,8 @@ def bruteParser(pdf):
         #recreate XML structure 'best' we can...
         assert allobjects[0].tag == 'header'
         root_element = create_tree('pdf', [allobjects.pop(0)], span=(0,len(pdf)), version="OPAF!(raw)")
+        if budget is not None and budget.reason is not None:
+            root_element.set('partial', budget.reason)
         
         update = create_tree('pdf_update', [],span=(0xfffffff,-1))
         while len(allobjects)>0:
@@ -375,48 +888,433 @@ def bruteParser(pdf):
         print e,e,e
         raise e
 
-def xrefParser(pdf):
+#Object headers and classic xref tables, used to split the file in chunks
+_obj_header = re.compile(r'(?<![0-9])'+PDFLexer.t_OBJ.__doc__)
+_xref_keyword = re.compile(PDFLexer.t_XREF.regex)
+
+def _xrefOffsets(pdf):
+    '''
+        The offsets of the in use objects of all the classic xref tables in
+        the file and the end of the last table. None if there are none or 
+        any of them does not point to the header of the object it describes.
+    '''
+    offsets = set()
+    last = 0
+    for m in _xref_keyword.finditer(pdf):
+        table, end = XrefTable.read(pdf, m.end())
+        if table.subsections:
+            last = end
+        for first, size, offs, gens, used in table.subsections:
+            for i in xrange(len(offs)):
+                if not used[i]:
+                    continue
+                header = _obj_header.match(pdf, offs[i])
+                if not header or [int(x) for x in header.group(0).split('\x20')[:2]] != [first+i, gens[i]]:
+                    return None
+                offsets.add(offs[i])
+    return offsets and (offsets, last) or None
+
+def _parseChunks((backend, use_length, spans, chunks)):
     '''
-        This will try to parse the pdf based on the tree of cross references.
-        Hard, uninmplemented and insane.
+        Process pool worker. Parse a list of (offset, data) chunks with 
+        the indirect start symbol. Elements can not be pickled so they are 
+        sent back serialized. None if any of the chunks fails.
     '''
-    assert False, "Uninmplemented!"
-    if False:                
+    session = ParserSession('indirect', backend, use_length, spans)
+    result = []
+    for start, data in chunks:
         try:
-            xrefpos = int(pdf[startxrefpos+9:])     
-        except:
-            logger.info("Damn! Startxref is broken! Lower chances of parsing this..")
-            #Idea: look for lowest xref/Root an try there
-            #If not try obj/endobj
-            assert False, "Unimplemented"
-        if pdf[xrefpos].isnum() :
-            logger("Main cross reference is a XrefStream")
-            assert False, "Unimplemented"
-        elif pdf[xrefpos:xrefpos+5] == "xref" :
-            logger("Main cross reference is a NoRMAL xref")
-            assert False, "uninmplemented"                                    
+            xml = session.parse(data)
+        except Exception, e:
+            logger.info("Couldn't parse chunk at %d (%s)", start, e)
+            return None
+        if xml is None or session.errors:
+            return None
+        xml.span_move(start)
+        result.append(etree.tostring(xml))
+    return result
+
+def _parseStrict(tag, data, backend, use_length, spans='all'):
+    ''' Like parse but raise on any syntax error '''
+    session = ParserSession(tag, backend, use_length, spans)
+    xml = session.parse(data)
+    assert xml is not None and not session.errors, "Syntax error parsing %s"%tag
+    return xml
+
+def _parseGap(pdf, start, end, backend, use_length, spans='all'):
+    '''
+        Parse what lays between two objects, the header, the xref and 
+        trailer and the startxref/%%EOF. Returns a list of nodes in file
+        order.
+    '''
+    gap = pdf[start:end]
+    nodes = []
+    xref = startxref = None
+    for tok in backends['fast']().itertokens(gap):
+        if tok.type == 'HEADER':
+            nodes.append(create_leaf('header', tok.value, span=spans != 'none' and (start+tok.lexpos, start+tok.endlexpos) or None))
+        elif tok.type == 'XREF' and xref is None:
+            xref = tok.lexpos
+        elif tok.type == 'STARTXREF':
+            if xref is not None:
+                xml = _parseStrict('xref', gap[xref:tok.lexpos], backend, use_length, spans)
+                xml.span_move(start+xref)
+                nodes.append(xml)
+                xref = None
+            startxref = tok.lexpos
+        elif tok.type == 'EOF':
+            assert startxref is not None, "%%%%EOF without startxref at %d"%(start+tok.lexpos)
+            xml = _parseStrict('pdf_end', gap[startxref:tok.lexpos+5], backend, use_length, spans)
+            xml.span_move(start+startxref)
+            nodes.append(xml)
+            startxref = None
+        else:
+            assert xref is not None, "Unexpected %s between objects at %d"%(tok.type, start+tok.lexpos)
+    assert xref is None, "xref without startxref at %d"%(start+xref)
+    return nodes
+
+def parallelParser(pdf,jobs=None,backend='ply',use_length=False,spans='all',recover=False):
+    '''
+        Same result as normalParser but the indirect objects are parsed by
+        a pool of jobs processes (one per cpu by default). The file is split 
+        at the object headers, taken from the xref tables when they are 
+        all right or else from a raw scan. If any chunk fails to parse on 
+        its own the whole file is parsed with normalParser (with recover
+        if asked to).
+    '''
+    #Only here, it is slow to import and most runs never get this far
+    import multiprocessing
+    keep = spans != 'none'
+    try:
+        offsets = [m.start() for m in _obj_header.finditer(pdf)]
+        xref = _xrefOffsets(pdf)
+        if xref is None:
+            logger.info("No usable xref table, using all the object headers")
         else:
-            logger("XREF not found. Is this a pdf? Where did you get this?")
-            assert False, "uninmplemented"                    
-    #cri cri...
+            #Headers not in the tables are in streams or strings, unless they
+            #come after the last table (updates with xref streams)
+            listed, last = xref
+            offsets = sorted(listed.union([offset for offset in offsets if offset > last]))
+        assert offsets, "No objects found"
+        #Each chunk runs from an object header to the last endobj before the next one
+        chunks = []
+        for i in xrange(len(offsets)):
+            limit = i+1 < len(offsets) and offsets[i+1] or len(pdf)
+            end = pdf.rfind('endobj', offsets[i], limit)
+            assert end >= 0, "No endobj for the object at %d"%offsets[i]
+            chunks.append((offsets[i], end+6))
+        logger.info("Parsing %d objects in parallel", len(chunks))
+
+        #Batches of about the same size, a few per process
+        jobs = jobs or multiprocessing.cpu_count()
+        size = max(1, (len(pdf)+jobs*4-1)/(jobs*4))
+        batches = [[]]
+        total = 0
+        for start, end in chunks:
+            if total >= size:
+                batches.append([])
+                total = 0
+            batches[-1].append((start, pdf[start:end]))
+            total += end-start
+        batches = [(backend, use_length, spans, batch) for batch in batches]
+        if jobs > 1:
+            pool = multiprocessing.Pool(jobs)
+            try:
+                results = pool.map(_parseChunks, batches)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = map(_parseChunks, batches)
+        assert None not in results, "Some object can not be parsed on its own"
+
+        #Merge the objects and the gaps between them back in file order
+        nodes = _parseGap(pdf, 0, chunks[0][0], backend, use_length, spans)
+        assert nodes and nodes[0].tag == 'header', "Header not found"
+        header = nodes.pop(0)
+        objects = iter([etree.fromstring(xml, PDF.parser) for result in results for xml in result])
+        for i in xrange(len(chunks)):
+            nodes.append(objects.next())
+            limit = i+1 < len(chunks) and chunks[i+1][0] or len(pdf)
+            nodes += _parseGap(pdf, chunks[i][1], limit, backend, use_length, spans)
+
+        updates = []
+        update = []
+        for node in nodes:
+            assert node.tag != 'header', "Unexpected header"
+            update.append(node)
+            if node.tag == 'startxref':
+                #Either a classic xref or the last object must be a xref stream 
+                assert len(update) > 1 and (update[-2].tag == 'xref' or update[-2].isStream()), "Missing xref before a startxref"
+                xml = create_tree('pdf_update', update, span=keep and (0xffffffff,-1) or None)
+                if keep:
+                    [xml.span_expand(e.span) for e in update]
+                updates.append(xml)
+                update = []
+        assert updates and not update, "Missing ending %%EOF"
+        return create_tree('pdf', [header] + updates, span=keep and (header.span[0], updates[-1][-1].span[1]) or None, version="OPAF!")
+    except Exception, e:
+        logger.info("Can not parse it in parallel, parsing it sequentially (%s)", e)
+        return normalParser(pdf,backend,use_length,spans,recover=recover)
+
+def _strictSession(tag, pdf, pos, stop, backend, use_length):
+    ''' Parse pdf at pos up to the stop token, raise on any syntax error '''
+    session = ParserSession(tag, backend, use_length)
+    xml = session.parse(pdf, pos, stop)
+    assert xml is not None and not session.errors, "Syntax error parsing %s at %d"%(tag, pos)
+    return xml, session
+
+def _xrefSection(pdf, pos, backend, use_length):
+    '''
+        Parse the cross reference section at pos, a classic table and its
+        trailer or a xref stream. Returns the section node, the trailer (a
+        python dict), the entries as (number, type, offset or ObjStm number,
+        generation or index) and the position where the section ends.
+    '''
+    entries = []
+    if pdf[pos:pos+4] == 'xref':
+        xml, session = _strictSession('xref', pdf, pos, 'DOUBLE_GREATER_THAN_SIGN', backend, use_length)
+        table, end = XrefTable.read(xml[1].value)
+        for first, size, offsets, gens, used in table.subsections:
+            for i in xrange(len(offsets)):
+                entries.append((first+i, used[i], offsets[i], gens[i]))
+        return xml, xml[0].value, entries, session.lexer.lexpos
+
+    xml, session = _strictSession('indirect', pdf, pos, 'ENDOBJ', backend, use_length)
+    assert xml.isStream(), "No xref table nor xref stream at %d"%pos
+    stream = xml.object
+    trailer = stream.dictionary.value
+    assert trailer.get('Type', None) == 'XRef', "No xref table nor xref stream at %d"%pos
+    filters = trailer.get('Filter', [])
+    params = trailer.get('DecodeParms', None)
+    if type(filters) != list:
+        filters, params = [filters], [params]
+    data = stream.data.value
+    #Unfiltered data keeps the EOL before endstream, /Length tells it apart
+    length = trailer.get('Length', None)
+    if type(length) in [int, long] and len(data) > length:
+        data = data[:length]
+    for name, param in zip(filters, params or [None]*len(filters)):
+        data = defilterData(name, data, param or {})
+        assert data is not None, "Unsupported filter %s in the xref stream at %d"%(name, pos)
+
+    #Fields requiring more than one byte are stored with the high-order byte first.
+    widths = trailer['W']
+    index = trailer.get('Index', [0, trailer['Size']])
+    size = sum(widths)
+    numbers = []
+    for first, count in zip(index[0::2], index[1::2]):
+        numbers += range(first, first+count)
+    #Some trailing bytes (an EOL) are fine, not a whole entry more or less
+    extra = len(data) - len(numbers)*size
+    assert 0 <= extra < max(size, 1), "Xref stream at %d has %d bytes, %d expected"%(pos, len(data), len(numbers)*size)
+    if extra:
+        logger.info("Ignoring %d trailing bytes in the xref stream at %d", extra, pos)
+    at = 0
+    for n in numbers:
+        fields = []
+        for width in widths:
+            value = 0
+            for c in data[at:at+width]:
+                value = (value<<8) + ord(c)
+            fields.append(value)
+            at += width
+        #A missing type field means type 1
+        if widths[0] == 0:
+            fields[0] = 1
+        #Anything else means the stream was not decoded right
+        assert fields[0] in [0, 1, 2], "Wrong type %d for object %d in the xref stream at %d"%(fields[0], n, pos)
+        entries.append((n, fields[0], fields[1], fields[2]))
+    return xml, trailer, entries, session.lexer.lexpos
 
-def multiParser(pdf):
+def xrefParser(pdf,backend='ply',use_length=False,budget=None):
+    '''
+        This will parse the pdf based on the tree of cross references.
+        Start at the last startxref, follow the /XRefStm and /Prev chains
+        and parse every object in use straight at its offset. Junk between
+        the objects is never read. Compressed objects are left in their 
+        ObjStm. The newest entry of an object wins, older versions are
+        not parsed. If the budget runs out the objects not parsed yet are
+        left out.
+    '''
+    pos = pdf.rfind('startxref')
+    m = re.compile(r'startxref[\x20\r\n\t\x0c\x00]+([0-9]+)').match(pdf, max(pos, 0))
+    assert pos >= 0 and m, "startxref not found"
+
+    #Sections in lookup order: a table, its XRefStm, then its Prev
+    sections = []
+    #Section k is the XRefStm of the table hybrid[k]
+    hybrid = {}
+    pending = [(int(m.group(1)), None)]
+    seen = set()
+    while pending:
+        pos, table = pending.pop()
+        if pos in seen:
+            logger.info("Loop in the xref chain at %d", pos)
+            continue
+        seen.add(pos)
+        xml, trailer, entries, end = _xrefSection(pdf, pos, backend, use_length)
+        logger.info("Got %d xref entries at %d", len(entries), pos)
+        if table is not None:
+            hybrid[len(sections)] = table
+        if 'Prev' in trailer:
+            pending.append((int(trailer['Prev']), None))
+        if 'XRefStm' in trailer:
+            pending.append((int(trailer['XRefStm']), len(sections)))
+        sections.append((pos, xml, entries, end))
+
+    #The first section listing an object number wins. But a hybrid file
+    #marks free in its table the objects that only its XRefStm knows about
+    owner = {}
+    for k, (pos, xml, entries, end) in enumerate(sections):
+        for n, ty, a, b in entries:
+            first = owner.get(n)
+            if first is None or (first[1] == 0 and ty != 0 and hybrid.get(k) == first[0]):
+                owner[n] = (k, ty, a, b)
+    streams = set([pos for pos, xml, entries, end in sections if xml.tag == 'indirect_object'])
+    objects = [[] for section in sections]
+    session = ParserSession('indirect', backend, use_length, budget=budget)
+    for n, (k, ty, offset, gen) in owner.items():
+        if ty != 1 or offset in streams:
+            continue
+        try:
+            xml = session.parse(pdf, offset, 'ENDOBJ')
+        except Budget.Exceeded:
+            break
+        assert xml is not None and not session.errors, "Can not parse object %d %d at %d"%(n, gen, offset)
+        assert xml.get('id') == "%d %d"%(n, gen), "Object %d %d is not at %d"%(n, gen, offset)
+        objects[k].append(xml)
+
+    #Each update ends at a startxref/%%EOF after its section. A section
+    #with none (like the XRefStm of an hybrid file) joins the next update
+    xml_updates = []
+    update = []
+    session = ParserSession('pdf_end', backend, use_length)
+    for k in sorted(range(len(sections)), key=lambda k: sections[k][0]):
+        pos, xml, entries, end = sections[k]
+        update += objects[k] + [xml]
+        try:
+            pdf_end = session.parse(pdf, end, 'EOF')
+        except Exception, e:
+            pdf_end = None
+        if pdf_end is None or session.errors:
+            continue
+        update = sorted(update, key=lambda e: e.span[0]) + [pdf_end]
+        xml_updates.append(create_tree('pdf_update', update, span=(0xffffffff,-1)))
+        update = []
+    if update:
+        logger.info("Missing ending %%EOF")
+        update = sorted(update, key=lambda e: e.span[0]) + [create_leaf('startxref', sections[0][0], span=(len(pdf),len(pdf)))]
+        xml_updates.append(create_tree('pdf_update', update, span=(0xffffffff,-1)))
+    for xml_update in xml_updates:
+        [xml_update.span_expand(e.span) for e in xml_update]
+
+    header = re.compile(r'%PDF-1\.[0-7]').search(pdf, 0, 1024)
+    if header:
+        xml_header = create_leaf('header', header.group(0)[-3:], span=(header.start(),header.end()))
+    else:
+        logger.info("%%%%PDF-N-M tag was not found! Creating a dummy.")
+        xml_header = create_leaf('header', "NOVERSION", span=(0,0))
+    xml = create_tree('pdf', [xml_header] + xml_updates, span=(0,len(pdf)), version="OPAF!(xref)")
+    if budget is not None and budget.reason is not None:
+        xml.set('partial', budget.reason)
+    return xml
+
+#Allowed between two objects of a sequential pdf
+_between = re.compile(r'(?:[%s]+|%%[^\r\n]*[\r\n]?|xref.*?%%%%EOF|startxref[%s]+[0-9]+[%s]+%%%%EOF)*'%(
+                        (PDFLexer.white_spaces_r,)*3), re.DOTALL)
+_delimiter = r"[()<>\[\]/%\x20\r\n\t\x0c\x00]"
+
+def preScan(pdf):
+    '''
+        Quick byte level look at the raw file to pick the parsing strategy.
+        It checks the header position, the obj/endobj balance and what
+        lays between the objects, the last startxref and the classic xref
+        offsets. Returns a dict with the findings, the chosen 'strategy' 
+        ('normal', 'xref' or 'brute') and the 'time' it took.
+    '''
+    start = time.time()
+    report = {}
+    header = re.compile(r'%PDF-1\.[0-7]').search(pdf, 0, 1024)
+    report['header'] = header and header.start()
+    objs = [m.span() for m in re.finditer(r'\d+\x20\d+\x20obj'+_delimiter, pdf)]
+    endobjs = [m.span() for m in re.finditer(_delimiter+r'endobj', pdf)]
+    report['objs'], report['endobjs'] = len(objs), len(endobjs)
+
+    #Sequential: every obj closed by an endobj before the next obj and 
+    #only whitespace, comments and xref/trailer/startxref in between
+    sequential = report['header'] == 0 and len(objs) == len(endobjs) > 0
+    if sequential:
+        gaps = [(header.end(), objs[0][0])]
+        for i in xrange(len(objs)):
+            limit = i+1 < len(objs) and objs[i+1][0] or len(pdf)
+            if not objs[i][1] <= endobjs[i][0]+1 or endobjs[i][1] > limit:
+                sequential = False
+                break
+            gaps.append((endobjs[i][1], limit))
+        sequential = sequential and all([_between.match(pdf, a, b).end() == b for a, b in gaps])
+    report['sequential'] = sequential
+
+    #The last startxref shall point to a xref table or a xref stream object
+    pos = pdf.rfind('startxref')
+    m = pos >= 0 and re.compile(r'startxref[\x20\r\n\t\x0c\x00]+([0-9]+)').match(pdf, pos)
+    report['startxref'] = m and int(m.group(1))
+    report['startxref_ok'] = bool(m) and (pdf[report['startxref']:report['startxref']+4] == 'xref' or
+                                           _obj_header.match(pdf, report['startxref']) is not None)
+    #The classic tables, if any, shall point to the objects they describe
+    report['xref_ok'] = not re.search('(?<!start)'+PDFLexer.t_XREF.regex, pdf) or _xrefOffsets(pdf) is not None
+
+    if sequential:
+        report['strategy'] = 'normal'
+    elif report['startxref_ok'] and report['xref_ok']:
+        report['strategy'] = 'xref'
+    else:
+        report['strategy'] = 'brute'
+    report['time'] = time.time() - start
+    return report
+
+def multiParser(pdf,backend='ply',use_length=False,jobs=1,budget=None):
     ''' 
         Try the different parsing strategies in some preference order...
+        A preScan picks the first one to try, the rest are fallbacks.
+        When the preScan finds the file sequential, the sequential parser
+        skips the objects it can not read instead of falling back, unless
+        it had to skip more than those.
+        With more than one job the sequential parsing is done in parallel,
+        unless there is a budget, which the workers could not share.
+        The budget is shared by all the strategies tried.
     '''
+    report = preScan(pdf)
+    logger.info("Pre-scan chose the %s parser in %.3fs (%s)", report['strategy'], report['time'],
+                ', '.join(['%s=%s'%(k, report[k]) for k in sorted(report.keys()) if k not in ['strategy', 'time']]))
+    def normal():
+        recover = report['strategy'] == 'normal'
+        if jobs > 1 and budget is None:
+            xml = parallelParser(pdf,jobs,backend,use_length,recover=recover)
+        else:
+            xml = normalParser(pdf,backend,use_length,budget=budget,recover=recover)
+        #Skipping more than the broken objects is worse than the fallbacks
+        if xml is not None and xml.get('errors') is not None:
+            lost = _lostObjects(pdf, xml)
+            assert not lost, "Recovery dropped %d more objects (%s)"%(len(lost), xml.get('errors'))
+        return xml
+    strategies = [('normal', normal),
+                  ('xref', lambda: xrefParser(pdf,backend,use_length,budget)),
+                  ('brute', lambda: bruteParser(pdf,backend,use_length,budget))]
+    strategies.sort(key=lambda (name, f): name != report['strategy'])
+
     #fallback chain of different type of parsing algorithms
-    try:
-        return normalParser(pdf)
-    except Exception, e:
-        logger.info("PDF is NOT a sequence of objects as it SHALL be, for discussion see http://bit.ly/coRMtc ("+str(e)+")")
-    try:
-        return bruteParser(pdf)
-    except Exception, e:
-        logger.error("Can not parse it with a relaxed parser either ("+str(e)+")")
-    try:
-        return xrefParser(pdf)
-    except Exception, e:
-        logger.info("Couldn't parse it. Damn! ("+str(e) +")")
+    for name, f in strategies:
+        try:
+            return f()
+        except Exception, e:
+            if name == 'normal':
+                logger.info("PDF is NOT a sequence of objects as it SHALL be, for discussion see http://bit.ly/coRMtc ("+str(e)+")")
+            else:
+                logger.info("Can not parse it with the %s parser either (%s)", name, e)
+        if budget is not None and budget.reason is not None:
+            break
+    logger.error("Couldn't parse it. Damn!")
     return None
 
 
@@ -1,60 +1,61 @@
 
-# opaflib/parsetab_indirect.py
+# parsetab_indirect.py
 # This file is automatically generated. Do not edit.
-_tabversion = '3.2'
+# pylint: disable=W,C,R
+_tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'p\x19)\xc3\x03\x87\x989n-J\x00/\xe7yg'
+_lr_signature = 'indirectDOUBLE_GREATER_THAN_SIGN DOUBLE_LESS_THAN_SIGN ENDOBJ EOF FALSE HEADER HEXSTRING LEFT_SQUARE_BRACKET NAME NULL NUMBER OBJ R RIGHT_SQUARE_BRACKET STARTXREF STREAM_DATA STRING TRAILER TRUE XREF pdf : HEADER pdf_update_list array : LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET  object_list : object_list object  object_list :  object : NAME  object : STRING  object : HEXSTRING  object : NUMBER  object : TRUE  object : FALSE  object : NULL  object : R  object : dictionary  object : array  dictionary : DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN  dictionary_entry_list : dictionary_entry_list NAME object\n                              |   indirect : indirect_object_stream\n                 | indirect_object  indirect_object : OBJ object ENDOBJ  indirect_object_stream : OBJ dictionary STREAM_DATA ENDOBJ  xref : XREF TRAILER dictionary  xref : indirect_object_stream  pdf_update : body xref pdf_end  pdf_end : STARTXREF EOF pdf_update_list : pdf_update_list pdf_update  pdf_update_list : pdf_update  body : body indirect_object \n             | body indirect_object_stream  body :  pdf_brute_end : XREF TRAILER  dictionary STARTXREF EOF'
     
-_lr_action_items = {'DOUBLE_GREATER_THAN_SIGN':([6,8,9,11,12,13,14,15,16,17,19,22,25,27,29,],[-5,-7,-17,-8,-12,-10,-14,-11,-9,-6,-13,27,-2,-15,-16,]),'FALSE':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[13,13,-5,-7,-8,-12,-10,-14,-11,-9,-6,13,-13,-2,-15,13,]),'NAME':([1,5,6,8,9,11,12,13,14,15,16,17,18,19,22,25,27,28,29,],[6,6,-5,-7,-17,-8,-12,-10,-14,-11,-9,-6,6,-13,28,-2,-15,6,-16,]),'ENDOBJ':([6,7,8,10,11,12,13,14,15,16,17,21,25,27,],[-5,-13,-7,23,-8,-12,-10,-14,-11,-9,-6,26,-2,-15,]),'HEXSTRING':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[8,8,-5,-7,-8,-12,-10,-14,-11,-9,-6,8,-13,-2,-15,8,]),'DOUBLE_LESS_THAN_SIGN':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[9,9,-5,-7,-8,-12,-10,-14,-11,-9,-6,9,-13,-2,-15,9,]),'NUMBER':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[11,11,-5,-7,-8,-12,-10,-14,-11,-9,-6,11,-13,-2,-15,11,]),'LEFT_SQUARE_BRACKET':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[5,5,-5,-7,-8,-12,-10,-14,-11,-9,-6,5,-13,-2,-15,5,]),'RIGHT_SQUARE_BRACKET':([5,6,8,11,12,13,14,15,16,17,18,19,20,24,25,27,],[-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,-4,-13,25,-3,-2,-15,]),'R':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[12,12,-5,-7,-8,-12,-10,-14,-11,-9,-6,12,-13,-2,-15,12,]),'STREAM_DATA':([7,27,],[21,-15,]),'OBJ':([0,],[1,]),'NULL':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[15,15,-5,-7,-8,-12,-10,-14,-11,-9,-6,15,-13,-2,-15,15,]),'TRUE':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[16,16,-5,-7,-8,-12,-10,-14,-11,-9,-6,16,-13,-2,-15,16,]),'$end':([2,3,4,23,26,],[-19,-18,0,-20,-21,]),'STRING':([1,5,6,8,11,12,13,14,15,16,17,18,19,25,27,28,],[17,17,-5,-7,-8,-12,-10,-14,-11,-9,-6,17,-13,-2,-15,17,]),}
+_lr_action_items = {'DOUBLE_GREATER_THAN_SIGN':([6,8,9,11,12,13,14,15,16,17,20,23,24,26,28,],[-5,-7,-17,-8,-12,-10,-14,-11,-9,-6,26,-13,-2,-15,-16,]),'FALSE':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[13,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,13,-3,-13,-2,-15,13,]),'NAME':([1,5,6,8,9,11,12,13,14,15,16,17,18,20,22,23,24,26,27,28,],[6,-4,-5,-7,-17,-8,-12,-10,-14,-11,-9,-6,6,27,-3,-13,-2,-15,6,-16,]),'ENDOBJ':([6,7,8,10,11,12,13,14,15,16,17,19,24,26,],[-5,-13,-7,21,-8,-12,-10,-14,-11,-9,-6,25,-2,-15,]),'HEXSTRING':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[8,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,8,-3,-13,-2,-15,8,]),'DOUBLE_LESS_THAN_SIGN':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[9,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,9,-3,-13,-2,-15,9,]),'NUMBER':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[11,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,11,-3,-13,-2,-15,11,]),'LEFT_SQUARE_BRACKET':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[5,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,5,-3,-13,-2,-15,5,]),'RIGHT_SQUARE_BRACKET':([5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,],[-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,24,-3,-13,-2,-15,]),'R':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[12,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,12,-3,-13,-2,-15,12,]),'STREAM_DATA':([7,26,],[19,-15,]),'OBJ':([0,],[1,]),'NULL':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[15,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,15,-3,-13,-2,-15,15,]),'TRUE':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[16,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,16,-3,-13,-2,-15,16,]),'$end':([2,3,4,21,25,],[-19,-18,0,-20,-21,]),'STRING':([1,5,6,8,11,12,13,14,15,16,17,18,22,23,24,26,27,],[17,-4,-5,-7,-8,-12,-10,-14,-11,-9,-6,17,-3,-13,-2,-15,17,]),}
 
-_lr_action = { }
+_lr_action = {}
 for _k, _v in _lr_action_items.items():
    for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = { }
+      if not _x in _lr_action:  _lr_action[_x] = {}
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'object_list':([5,18,],[20,24,]),'dictionary':([1,5,18,28,],[7,19,19,19,]),'object':([1,5,18,28,],[10,18,18,29,]),'dictionary_entry_list':([9,],[22,]),'indirect_object':([0,],[2,]),'indirect_object_stream':([0,],[3,]),'indirect':([0,],[4,]),'array':([1,5,18,28,],[14,14,14,14,]),}
+_lr_goto_items = {'object_list':([5,],[18,]),'dictionary':([1,18,27,],[7,23,23,]),'object':([1,18,27,],[10,22,28,]),'dictionary_entry_list':([9,],[20,]),'indirect_object':([0,],[2,]),'indirect_object_stream':([0,],[3,]),'indirect':([0,],[4,]),'array':([1,18,27,],[14,14,14,]),}
 
-_lr_goto = { }
+_lr_goto = {}
 for _k, _v in _lr_goto_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = { }
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
        _lr_goto[_x][_k] = _y
 del _lr_goto_items
 _lr_productions = [
   ("S' -> indirect","S'",1,None,None,None),
-  ('pdf -> HEADER pdf_update_list','pdf',2,'p_pdf','opaflib/parser.py',24),
-  ('array -> LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET','array',3,'p_array','opaflib/parser.py',36),
-  ('object_list -> object object_list','object_list',2,'p_object_list','opaflib/parser.py',40),
-  ('object_list -> <empty>','object_list',0,'p_object_list_empty','opaflib/parser.py',44),
-  ('object -> NAME','object',1,'p_object_name','opaflib/parser.py',49),
-  ('object -> STRING','object',1,'p_object_string','opaflib/parser.py',53),
-  ('object -> HEXSTRING','object',1,'p_object_hexstring','opaflib/parser.py',57),
-  ('object -> NUMBER','object',1,'p_object_number','opaflib/parser.py',61),
-  ('object -> TRUE','object',1,'p_object_true','opaflib/parser.py',65),
-  ('object -> FALSE','object',1,'p_object_false','opaflib/parser.py',69),
-  ('object -> NULL','object',1,'p_object_null','opaflib/parser.py',73),
-  ('object -> R','object',1,'p_object_ref','opaflib/parser.py',77),
-  ('object -> dictionary','object',1,'p_object_dictionary','opaflib/parser.py',82),
-  ('object -> array','object',1,'p_object_array','opaflib/parser.py',86),
-  ('dictionary -> DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN','dictionary',3,'p_dictionary','opaflib/parser.py',96),
-  ('dictionary_entry_list -> dictionary_entry_list NAME object','dictionary_entry_list',3,'p_dictionary_entry_list','opaflib/parser.py',100),
-  ('dictionary_entry_list -> <empty>','dictionary_entry_list',0,'p_dictionary_entry_list','opaflib/parser.py',101),
-  ('indirect -> indirect_object_stream','indirect',1,'p_indirect','opaflib/parser.py',119),
-  ('indirect -> indirect_object','indirect',1,'p_indirect','opaflib/parser.py',120),
-  ('indirect_object -> OBJ object ENDOBJ','indirect_object',3,'p_indirect_object','opaflib/parser.py',125),
-  ('indirect_object_stream -> OBJ dictionary STREAM_DATA ENDOBJ','indirect_object_stream',4,'p_indirect_object_stream','opaflib/parser.py',129),
-  ('xref -> XREF TRAILER dictionary','xref',3,'p_xref_common','opaflib/parser.py',146),
-  ('xref -> indirect_object_stream','xref',1,'p_xref_stream','opaflib/parser.py',152),
-  ('pdf_update -> body xref pdf_end','pdf_update',3,'p_pdf_update','opaflib/parser.py',157),
-  ('pdf_end -> STARTXREF EOF','pdf_end',2,'p_pdf_end','opaflib/parser.py',168),
-  ('pdf_update_list -> pdf_update_list pdf_update','pdf_update_list',2,'p_pdf_update_list','opaflib/parser.py',172),
-  ('pdf_update_list -> pdf_update','pdf_update_list',1,'p_pdf_update_list_one','opaflib/parser.py',178),
-  ('body -> body indirect_object','body',2,'p_body_object','opaflib/parser.py',183),
-  ('body -> body indirect_object_stream','body',2,'p_body_object','opaflib/parser.py',184),
-  ('body -> <empty>','body',0,'p_body_void','opaflib/parser.py',190),
-  ('pdf_brute_end -> XREF TRAILER dictionary STARTXREF EOF','pdf_brute_end',5,'p_pdf_brute_end','opaflib/parser.py',202),
+  ('pdf -> HEADER pdf_update_list','pdf',2,'p_pdf','parser.py',27),
+  ('array -> LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET','array',3,'p_array','parser.py',39),
+  ('object_list -> object_list object','object_list',2,'p_object_list','parser.py',45),
+  ('object_list -> <empty>','object_list',0,'p_object_list_empty','parser.py',50),
+  ('object -> NAME','object',1,'p_object_name','parser.py',55),
+  ('object -> STRING','object',1,'p_object_string','parser.py',59),
+  ('object -> HEXSTRING','object',1,'p_object_hexstring','parser.py',63),
+  ('object -> NUMBER','object',1,'p_object_number','parser.py',67),
+  ('object -> TRUE','object',1,'p_object_true','parser.py',73),
+  ('object -> FALSE','object',1,'p_object_false','parser.py',77),
+  ('object -> NULL','object',1,'p_object_null','parser.py',81),
+  ('object -> R','object',1,'p_object_ref','parser.py',85),
+  ('object -> dictionary','object',1,'p_object_dictionary','parser.py',90),
+  ('object -> array','object',1,'p_object_array','parser.py',94),
+  ('dictionary -> DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN','dictionary',3,'p_dictionary','parser.py',104),
+  ('dictionary_entry_list -> dictionary_entry_list NAME object','dictionary_entry_list',3,'p_dictionary_entry_list','parser.py',114),
+  ('dictionary_entry_list -> <empty>','dictionary_entry_list',0,'p_dictionary_entry_list','parser.py',115),
+  ('indirect -> indirect_object_stream','indirect',1,'p_indirect','parser.py',135),
+  ('indirect -> indirect_object','indirect',1,'p_indirect','parser.py',136),
+  ('indirect_object -> OBJ object ENDOBJ','indirect_object',3,'p_indirect_object','parser.py',141),
+  ('indirect_object_stream -> OBJ dictionary STREAM_DATA ENDOBJ','indirect_object_stream',4,'p_indirect_object_stream','parser.py',146),
+  ('xref -> XREF TRAILER dictionary','xref',3,'p_xref_common','parser.py',163),
+  ('xref -> indirect_object_stream','xref',1,'p_xref_stream','parser.py',170),
+  ('pdf_update -> body xref pdf_end','pdf_update',3,'p_pdf_update','parser.py',175),
+  ('pdf_end -> STARTXREF EOF','pdf_end',2,'p_pdf_end','parser.py',181),
+  ('pdf_update_list -> pdf_update_list pdf_update','pdf_update_list',2,'p_pdf_update_list','parser.py',185),
+  ('pdf_update_list -> pdf_update','pdf_update_list',1,'p_pdf_update_list_one','parser.py',190),
+  ('body -> body indirect_object','body',2,'p_body_object','parser.py',194),
+  ('body -> body indirect_object_stream','body',2,'p_body_object','parser.py',195),
+  ('body -> <empty>','body',0,'p_body_void','parser.py',200),
+  ('pdf_brute_end -> XREF TRAILER dictionary STARTXREF EOF','pdf_brute_end',5,'p_pdf_brute_end','parser.py',211),
 ]
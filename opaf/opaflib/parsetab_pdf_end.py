@@ -0,0 +1,61 @@
+
+# parsetab_pdf_end.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'pdf_endDOUBLE_GREATER_THAN_SIGN DOUBLE_LESS_THAN_SIGN ENDOBJ EOF FALSE HEADER HEXSTRING LEFT_SQUARE_BRACKET NAME NULL NUMBER OBJ R RIGHT_SQUARE_BRACKET STARTXREF STREAM_DATA STRING TRAILER TRUE XREF pdf : HEADER pdf_update_list array : LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET  object_list : object_list object  object_list :  object : NAME  object : STRING  object : HEXSTRING  object : NUMBER  object : TRUE  object : FALSE  object : NULL  object : R  object : dictionary  object : array  dictionary : DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN  dictionary_entry_list : dictionary_entry_list NAME object\n                              |   indirect : indirect_object_stream\n                 | indirect_object  indirect_object : OBJ object ENDOBJ  indirect_object_stream : OBJ dictionary STREAM_DATA ENDOBJ  xref : XREF TRAILER dictionary  xref : indirect_object_stream  pdf_update : body xref pdf_end  pdf_end : STARTXREF EOF pdf_update_list : pdf_update_list pdf_update  pdf_update_list : pdf_update  body : body indirect_object \n             | body indirect_object_stream  body :  pdf_brute_end : XREF TRAILER  dictionary STARTXREF EOF'
+    
+_lr_action_items = {'STARTXREF':([0,],[1,]),'EOF':([1,],[3,]),'$end':([2,3,],[0,-25,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'pdf_end':([0,],[2,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> pdf_end","S'",1,None,None,None),
+  ('pdf -> HEADER pdf_update_list','pdf',2,'p_pdf','parser.py',28),
+  ('array -> LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET','array',3,'p_array','parser.py',40),
+  ('object_list -> object_list object','object_list',2,'p_object_list','parser.py',46),
+  ('object_list -> <empty>','object_list',0,'p_object_list_empty','parser.py',51),
+  ('object -> NAME','object',1,'p_object_name','parser.py',56),
+  ('object -> STRING','object',1,'p_object_string','parser.py',60),
+  ('object -> HEXSTRING','object',1,'p_object_hexstring','parser.py',64),
+  ('object -> NUMBER','object',1,'p_object_number','parser.py',68),
+  ('object -> TRUE','object',1,'p_object_true','parser.py',74),
+  ('object -> FALSE','object',1,'p_object_false','parser.py',78),
+  ('object -> NULL','object',1,'p_object_null','parser.py',82),
+  ('object -> R','object',1,'p_object_ref','parser.py',86),
+  ('object -> dictionary','object',1,'p_object_dictionary','parser.py',91),
+  ('object -> array','object',1,'p_object_array','parser.py',95),
+  ('dictionary -> DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN','dictionary',3,'p_dictionary','parser.py',105),
+  ('dictionary_entry_list -> dictionary_entry_list NAME object','dictionary_entry_list',3,'p_dictionary_entry_list','parser.py',115),
+  ('dictionary_entry_list -> <empty>','dictionary_entry_list',0,'p_dictionary_entry_list','parser.py',116),
+  ('indirect -> indirect_object_stream','indirect',1,'p_indirect','parser.py',136),
+  ('indirect -> indirect_object','indirect',1,'p_indirect','parser.py',137),
+  ('indirect_object -> OBJ object ENDOBJ','indirect_object',3,'p_indirect_object','parser.py',142),
+  ('indirect_object_stream -> OBJ dictionary STREAM_DATA ENDOBJ','indirect_object_stream',4,'p_indirect_object_stream','parser.py',147),
+  ('xref -> XREF TRAILER dictionary','xref',3,'p_xref_common','parser.py',164),
+  ('xref -> indirect_object_stream','xref',1,'p_xref_stream','parser.py',171),
+  ('pdf_update -> body xref pdf_end','pdf_update',3,'p_pdf_update','parser.py',176),
+  ('pdf_end -> STARTXREF EOF','pdf_end',2,'p_pdf_end','parser.py',182),
+  ('pdf_update_list -> pdf_update_list pdf_update','pdf_update_list',2,'p_pdf_update_list','parser.py',186),
+  ('pdf_update_list -> pdf_update','pdf_update_list',1,'p_pdf_update_list_one','parser.py',191),
+  ('body -> body indirect_object','body',2,'p_body_object','parser.py',195),
+  ('body -> body indirect_object_stream','body',2,'p_body_object','parser.py',196),
+  ('body -> <empty>','body',0,'p_body_void','parser.py',201),
+  ('pdf_brute_end -> XREF TRAILER dictionary STARTXREF EOF','pdf_brute_end',5,'p_pdf_brute_end','parser.py',212),
+]
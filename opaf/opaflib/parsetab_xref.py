@@ -0,0 +1,61 @@
+
+# parsetab_xref.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'xrefDOUBLE_GREATER_THAN_SIGN DOUBLE_LESS_THAN_SIGN ENDOBJ EOF FALSE HEADER HEXSTRING LEFT_SQUARE_BRACKET NAME NULL NUMBER OBJ R RIGHT_SQUARE_BRACKET STARTXREF STREAM_DATA STRING TRAILER TRUE XREF pdf : HEADER pdf_update_list array : LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET  object_list : object_list object  object_list :  object : NAME  object : STRING  object : HEXSTRING  object : NUMBER  object : TRUE  object : FALSE  object : NULL  object : R  object : dictionary  object : array  dictionary : DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN  dictionary_entry_list : dictionary_entry_list NAME object\n                              |   indirect : indirect_object_stream\n                 | indirect_object  indirect_object : OBJ object ENDOBJ  indirect_object_stream : OBJ dictionary STREAM_DATA ENDOBJ  xref : XREF TRAILER dictionary  xref : indirect_object_stream  pdf_update : body xref pdf_end  pdf_end : STARTXREF EOF pdf_update_list : pdf_update_list pdf_update  pdf_update_list : pdf_update  body : body indirect_object \n             | body indirect_object_stream  body :  pdf_brute_end : XREF TRAILER  dictionary STARTXREF EOF'
+    
+_lr_action_items = {'DOUBLE_GREATER_THAN_SIGN':([6,9,12,14,15,16,17,18,19,20,22,23,24,25,28,],[-17,12,-15,-10,-6,-13,-7,-16,-8,-12,-14,-11,-9,-5,-2,]),'XREF':([0,],[3,]),'OBJ':([0,],[2,]),'NAME':([6,9,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,],[-17,13,-15,25,-10,-6,-13,-7,-16,-8,-12,-4,-14,-11,-9,-5,25,-3,-2,]),'ENDOBJ':([8,],[11,]),'HEXSTRING':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,17,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,17,-3,-2,]),'DOUBLE_LESS_THAN_SIGN':([2,7,12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[6,6,-15,6,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,6,-3,-2,]),'NUMBER':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,19,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,19,-3,-2,]),'LEFT_SQUARE_BRACKET':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,21,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,21,-3,-2,]),'R':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,20,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,20,-3,-2,]),'STREAM_DATA':([5,12,],[8,-15,]),'FALSE':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,14,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,14,-3,-2,]),'STRING':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,15,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,15,-3,-2,]),'NULL':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,23,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,23,-3,-2,]),'TRUE':([12,13,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,24,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,24,-3,-2,]),'RIGHT_SQUARE_BRACKET':([12,14,15,16,17,19,20,21,22,23,24,25,26,27,28,],[-15,-10,-6,-13,-7,-8,-12,-4,-14,-11,-9,-5,28,-3,-2,]),'TRAILER':([3,],[7,]),'$end':([1,4,10,11,12,],[0,-23,-22,-21,-15,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'xref':([0,],[1,]),'dictionary':([2,7,13,26,],[5,10,16,16,]),'object':([13,26,],[18,27,]),'dictionary_entry_list':([6,],[9,]),'indirect_object_stream':([0,],[4,]),'array':([13,26,],[22,22,]),'object_list':([21,],[26,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> xref","S'",1,None,None,None),
+  ('pdf -> HEADER pdf_update_list','pdf',2,'p_pdf','parser.py',28),
+  ('array -> LEFT_SQUARE_BRACKET object_list RIGHT_SQUARE_BRACKET','array',3,'p_array','parser.py',40),
+  ('object_list -> object_list object','object_list',2,'p_object_list','parser.py',46),
+  ('object_list -> <empty>','object_list',0,'p_object_list_empty','parser.py',51),
+  ('object -> NAME','object',1,'p_object_name','parser.py',56),
+  ('object -> STRING','object',1,'p_object_string','parser.py',60),
+  ('object -> HEXSTRING','object',1,'p_object_hexstring','parser.py',64),
+  ('object -> NUMBER','object',1,'p_object_number','parser.py',68),
+  ('object -> TRUE','object',1,'p_object_true','parser.py',74),
+  ('object -> FALSE','object',1,'p_object_false','parser.py',78),
+  ('object -> NULL','object',1,'p_object_null','parser.py',82),
+  ('object -> R','object',1,'p_object_ref','parser.py',86),
+  ('object -> dictionary','object',1,'p_object_dictionary','parser.py',91),
+  ('object -> array','object',1,'p_object_array','parser.py',95),
+  ('dictionary -> DOUBLE_LESS_THAN_SIGN dictionary_entry_list DOUBLE_GREATER_THAN_SIGN','dictionary',3,'p_dictionary','parser.py',105),
+  ('dictionary_entry_list -> dictionary_entry_list NAME object','dictionary_entry_list',3,'p_dictionary_entry_list','parser.py',115),
+  ('dictionary_entry_list -> <empty>','dictionary_entry_list',0,'p_dictionary_entry_list','parser.py',116),
+  ('indirect -> indirect_object_stream','indirect',1,'p_indirect','parser.py',136),
+  ('indirect -> indirect_object','indirect',1,'p_indirect','parser.py',137),
+  ('indirect_object -> OBJ object ENDOBJ','indirect_object',3,'p_indirect_object','parser.py',142),
+  ('indirect_object_stream -> OBJ dictionary STREAM_DATA ENDOBJ','indirect_object_stream',4,'p_indirect_object_stream','parser.py',147),
+  ('xref -> XREF TRAILER dictionary','xref',3,'p_xref_common','parser.py',164),
+  ('xref -> indirect_object_stream','xref',1,'p_xref_stream','parser.py',171),
+  ('pdf_update -> body xref pdf_end','pdf_update',3,'p_pdf_update','parser.py',176),
+  ('pdf_end -> STARTXREF EOF','pdf_end',2,'p_pdf_end','parser.py',182),
+  ('pdf_update_list -> pdf_update_list pdf_update','pdf_update_list',2,'p_pdf_update_list','parser.py',186),
+  ('pdf_update_list -> pdf_update','pdf_update_list',1,'p_pdf_update_list_one','parser.py',191),
+  ('body -> body indirect_object','body',2,'p_body_object','parser.py',195),
+  ('body -> body indirect_object_stream','body',2,'p_body_object','parser.py',196),
+  ('body -> <empty>','body',0,'p_body_void','parser.py',201),
+  ('pdf_brute_end -> XREF TRAILER dictionary STARTXREF EOF','pdf_brute_end',5,'p_pdf_brute_end','parser.py',212),
+]
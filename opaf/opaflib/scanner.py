@@ -0,0 +1,202 @@
+####################################################################
+## felipe.andres.manzano@gmail.com  http://feliam.wordpress.com/  ##
+## twitter.com/feliam        http://www.linkedin.com/in/fmanzano  ##
+####################################################################
+# Fast PDF scanner
+# It emits exactly the same token stream as PDFLexer but it does not use
+# PLY. A few big compiled regular expressions (taken from the PDFLexer
+# rules themselves so they can not drift apart) and a tight loop replace
+# the per token PLY dispatch and callbacks.
+import re
+from ply.lex import LexToken
+from opaflib.lexer import PDFLexer, XrefTable, endStream, unescapeName
+
+#logging facility
+import logging
+logger = logging.getLogger('SCANNER')
+
+def _rule(f):
+    ''' The regular expression of a PLY function rule '''
+    return getattr(f, 'regex', f.__doc__)
+
+#INITIAL state. Same order PLY uses: function rules as they are defined,
+#then string rules sorted by decreasing regular expression length
+_initial = [('STRING', _rule(PDFLexer.t_STRING)),
+            ('HEXSTRING', _rule(PDFLexer.t_HEXSTRING)),
+            ('NAME', _rule(PDFLexer.t_NAME)),
+            ('STREAM_DATA', _rule(PDFLexer.t_STREAM_DATA)),
+            ('OBJ', _rule(PDFLexer.t_OBJ)),
+            ('R', _rule(PDFLexer.t_R)),
+            ('NUMBER', _rule(PDFLexer.t_NUMBER)),
+            ('HEADER', _rule(PDFLexer.t_HEADER)),
+            ('XREF', _rule(PDFLexer.t_XREF)),
+            ('STARTXREF', _rule(PDFLexer.t_STARTXREF)),
+            ('COMMENT', _rule(PDFLexer.t_ignore_COMMENT)) ]
+_initial += sorted([(name, getattr(PDFLexer, 't_'+name)) for name in
+                      ['TRAILER', 'ENDOBJ', 'FALSE', 'EOF', 'TRUE', 'NULL',
+                       'LEFT_SQUARE_BRACKET', 'RIGHT_SQUARE_BRACKET',
+                       'DOUBLE_LESS_THAN_SIGN', 'DOUBLE_GREATER_THAN_SIGN']],
+                   key=lambda (name, regex): -len(regex))
+_initial_re = re.compile('|'.join(['(?P<%s>%s)'%r for r in _initial]), re.VERBOSE)
+_ignore_re = re.compile('[%s]*'%PDFLexer.white_spaces_r)
+
+#string state: runs of plain characters are consumed in one match
+_string_re = re.compile('(?P<CHARS>%s)|(?P<EOL>%s)|(?P<ESCAPED>%s)|(?P<LEFT>\\()|(?P<RIGHT>\\))|(?P<CHAR>.)'%(
+                         _rule(PDFLexer.t_string_LITERAL_STRING_CHARS),
+                         _rule(PDFLexer.t_string_LITERAL_STRING_EOL),
+                         _rule(PDFLexer.t_string_ESCAPED_SEQUENCE)))
+_escaped = { '\n': '', '\r': '', 'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', '(': '(', ')': ')', '\\': '\\' }
+
+class PDFScanner(object):
+    ''' Drop in replacement for the PLY built PDFLexer. It has the interface
+        the PLY parsers need (input/token) plus itertokens and lexify '''
+    tokens = PDFLexer.tokens
+
+    def __init__(self):
+        self.lexdata = None
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+        #Set by the parser: use /Length to skip the stream data
+        self.use_length = False
+        self.stream_length = None
+        self.pending_stream = None
+        self.log_comments = False
+
+    def build(self, **kwargs):
+        ''' Nothing to build, the scanner acts as its own lexer '''
+        return self
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self.lexlen = len(data)
+        self.stream_length = None
+        self.pending_stream = None
+        self.log_comments = logger.isEnabledFor(logging.DEBUG)
+
+    def _token(self, ty, value, lexpos):
+        tok = LexToken()
+        tok.type = ty
+        tok.value = value
+        tok.lineno = 1
+        tok.lexpos = lexpos
+        return tok
+
+    def _error(self, pos, txt):
+        tok = self._token('error', None, pos)
+        tok.lexer = self
+        self.lexpos = pos
+        return PDFLexer.Exception(tok, txt)
+
+    def _string(self, pos):
+        ''' Scan a literal string, pos points just after the opening ( '''
+        data, end = self.lexdata, self.lexlen
+        match = _string_re.match
+        chunks = []
+        depth = 1
+        while pos < end:
+            m = match(data, pos)
+            kind = m.lastgroup
+            value = m.group(kind)
+            if kind == 'CHARS' or kind == 'CHAR':
+                chunks.append(value)
+            elif kind == 'EOL':
+                chunks.append('\x0A')
+            elif kind == 'ESCAPED':
+                val = value[1:]
+                if val[0] in '0123':
+                    chunks.append(chr(int(val,8)))
+                elif val[0] in '4567':
+                    chunks.append(chr(int(val[:2],8)) + val[3:])
+                else:
+                    chunks.append(_escaped[val[0]])
+            elif kind == 'LEFT':
+                depth += 1
+                chunks.append('(')
+            else:
+                depth -= 1
+                if depth == 0:
+                    self.lexpos = m.end()
+                    return self._token('STRING', ''.join(chunks), pos)
+                chunks.append(')')
+            pos = m.end()
+        #Unterminated string, PLY drops it too
+        self.lexpos = end + 1
+        return None
+
+    def token(self):
+        if self.pending_stream is not None:
+            endStream(self, self.pending_stream)
+        data, pos, end = self.lexdata, self.lexpos, self.lexlen
+        match = _initial_re.match
+        ignore = _ignore_re.match
+        while True:
+            pos = ignore(data, pos).end()
+            if pos >= end:
+                self.lexpos = pos + 1
+                return None
+            m = match(data, pos)
+            if not m:
+                c = data[pos]
+                logger.error('Error at pos %d. Skipping byte %02x[%s]'%(pos, ord(c), c.isalpha() and c or '?'))
+                raise self._error(pos, 'Scanning limbo')
+            kind = m.lastgroup
+            value = m.group(kind)
+            self.lexpos = m.end()
+            if kind == 'NUMBER':
+                return self._token(kind, value, pos)
+            elif kind == 'NAME':
+                tok = self._token(kind, unescapeName(value[1:]), pos)
+                tok.endlexpos = self.lexpos + 1
+                return tok
+            elif kind == 'R':
+                tok = self._token(kind, tuple([int(x,10) for x in value.split('\x20')[:2]]), pos)
+                tok.endlexpos = self.lexpos
+                return tok
+            elif kind == 'OBJ':
+                return self._token(kind, tuple([int(x) for x in value.split('\x20')[:2]]), pos)
+            elif kind == 'STRING':
+                return self._string(self.lexpos)
+            elif kind == 'HEXSTRING':
+                value = ''.join([c for c in value if c not in PDFLexer.white_spaces+'<>'])
+                return self._token(kind, (value+('0'*(len(value)%2))).decode('hex'), pos)
+            elif kind == 'STREAM_DATA':
+                tok = self._token(kind, None, pos)
+                if self.use_length:
+                    #Completed on the next call, see PDFLexer.t_STREAM_DATA
+                    self.pending_stream = tok
+                else:
+                    endStream(self, tok)
+                return tok
+            elif kind == 'COMMENT':
+                if value.startswith('%%EOF'):
+                    return self._token('EOF', value, pos)
+                if self.log_comments:
+                    logger.debug("Ignoring comment <%s> at pos %d!!", value.encode('string_escape'), self.lexpos)
+                pos = self.lexpos
+            elif kind == 'HEADER':
+                tok = self._token(kind, value[-3:], pos)
+                tok.endlexpos = self.lexpos
+                return tok
+            elif kind == 'XREF':
+                tok = self._token(kind, None, pos)
+                tok.value, self.lexpos = XrefTable.read(data, self.lexpos)
+                return tok
+            elif kind == 'STARTXREF':
+                return self._token(kind, int(value[10:],10), pos)
+            else:
+                return self._token(kind, value, pos)
+
+    def itertokens(self, data):
+        ''' Lazy version of lexify '''
+        self.input(data)
+        token = self.token
+        while True:
+             tok = token()
+             if not tok: break
+             yield tok
+
+    def lexify(self, data):
+        ''' This translate a plain string (or a mmap) into a sequence of tokens '''
+        return list(self.itertokens(data))
@@ -1,5 +1,6 @@
 from lxml import etree
 from opaflib.filters import defilterData
+from bisect import bisect_left, bisect_right
 #Logging facility
 import logging,code 
 logger = logging.getLogger("OPAFXML")
@@ -7,25 +8,32 @@ logger = logging.getLogger("OPAFXML")
 class PDFXML(etree.ElementBase):
     ''' Base pdf-xml class. Every pdf token xml representation will
         have a span wich indicates where the original token layed in the file
+        (unless it was parsed with a cheaper span policy, see ParserSession)
     '''
     def _getspan(self):
-        return tuple([int(i) for i in self.get('span').split('~')])
+        begin, _, end = self.get('span').partition('~')
+        return (int(begin), int(end))
     def _setspan(self, value):
         self.set('span',"%d~%d"%value)
     def span_move(self,offset, recursive=True):
-        begin,end = self.span 
-        self.span = (begin+offset,end+offset)
-        if recursive:
-            for child in self.getchildren():
-                child.span_move(offset)
+        ''' Shift the span of this node (and of the whole subtree if 
+            recursive) by offset. Nodes without a span are left alone.
+        '''
+        for node in recursive and self.iter() or [self]:
+            span = node.get('span')
+            if span is not None:
+                begin, _, end = span.partition('~')
+                node.set('span',"%d~%d"%(int(begin)+offset,int(end)+offset))
     def span_expand(self,span):
         begin,end = self.span 
-        self.span = (min(begin,span[0]),max(end,span[1]))        
+        if span[0] < begin or span[1] > end:
+            self.span = (min(begin,span[0]),max(end,span[1]))
 
     def clear_span(self, recursive=True):
-        del self.attrib['span']
-        for child in self.getchildren():
-            child.clear_span()
+        if recursive:
+            etree.strip_attributes(self, 'span')
+        else:
+            self.attrib.pop('span', None)
     span = property(_getspan,_setspan)
 
     def _to_xml(self):
@@ -39,12 +47,31 @@ class PDFXML(etree.ElementBase):
     value = property(_to_python,_from_python)
     
     def __getattr__(self, name):
-        tags = set([e.tag for e in self])
-        if name in tags:
-            return self.xpath('./%s'%name)
+        ''' xml.tag returns the list of children with that tag '''
+        #iterchildren filters by tag in C, no xpath is compiled
+        children = list(self.iterchildren(name))
+        if children:
+            return children
         return getattr(super(PDFXML,self),name)
         
     
+    def _spanindex(self, lookup, pos):
+        ''' Run a SpanIndex lookup over this subtree. The index is kept on
+            this proxy. A miss is trusted unless the index found a node that
+            moved or the tree looks changed, then it is rebuilt once. '''
+        index = self.__dict__.get('_spans')
+        if index is not None:
+            node = getattr(index, lookup)(pos)
+            if node is not None or not (index.stale or index.changed()):
+                return node
+        self._spans = SpanIndex(self)
+        return getattr(self._spans, lookup)(pos)
+
+    def _signature(self):
+        ''' A cheap summary of the children: how many, first and last. 
+            The indexes kept on proxies compare it to trust a miss. '''
+        return (len(self), next(self.iterchildren(), None), next(self.iterchildren(reversed=True), None))
+
     def get_numgen(self):
         ''' Search the object and generation number of any pdf element '''
         if self.tag.startswith('indirect'):
@@ -53,6 +80,122 @@ class PDFXML(etree.ElementBase):
             return self.getparent().get_numgen()
 
 
+class SpanIndex(object):
+    ''' The top level nodes under root (the updates and the objects, xrefs,
+        startxrefs.. in them) sorted by where their span begins. Ties keep
+        document order, so an update comes before its first object. Inner
+        nodes are reached walking down from the top level node that covers
+        the position, so the index holds one proxy per object, not per node.
+    '''
+    def __init__(self, root):
+        self.root = root
+        nodes = root.xpath('descendant::*[@span and (parent::pdf or parent::pdf_update)]')
+        nodes = [(int(node.get('span').partition('~')[0]), node) for node in nodes]
+        nodes.sort(key=lambda x: x[0])
+        self.begins = [begin for begin, node in nodes]
+        self.nodes = [node for begin, node in nodes]
+        self.signature = self._signature()
+        #Set when a lookup finds an indexed node moved or removed
+        self.stale = False
+
+    def _signature(self):
+        ''' A cheap summary of the tree shape: root and its updates, each
+            with its first and last child '''
+        containers = [self.root] + list(self.root.iterchildren('pdf_update'))
+        return [(c, next(c.iterchildren(), None), next(c.iterchildren(reversed=True), None)) for c in containers]
+
+    def changed(self):
+        ''' Whether nodes were added or removed at the ends of root or of
+            its updates since the index was built '''
+        return self._signature() != self.signature
+
+    def _valid(self, node):
+        ''' node has a span and still hangs from root '''
+        if node.get('span') is not None and (node is self.root or self.root in node.iterancestors()):
+            return True
+        self.stale = True
+        return False
+
+    def _top(self, pos):
+        ''' The innermost indexed node (or ancestor of one) covering pos '''
+        #The last node beginning at or before pos is the innermost one
+        #covering it, or a descendant of it. Walk up from there.
+        i = bisect_right(self.begins, pos) - 1
+        if i < 0:
+            node = self.root
+        elif self._valid(self.nodes[i]):
+            node = self.nodes[i]
+        else:
+            return None
+        while node is not None:
+            if node.get('span') is not None:
+                begin, end = node.span
+                if begin <= pos < end:
+                    return node
+            if node is self.root:
+                break
+            node = node.getparent()
+        return None
+
+    def _down(self, node, pos):
+        ''' Walk down from node through the children covering pos. If
+            several do (xref data spans its trailer) take the narrowest. '''
+        while True:
+            inner = None
+            for child in node.iterchildren():
+                span = child.get('span')
+                if span is None:
+                    continue
+                begin, _, end = span.partition('~')
+                begin, end = int(begin), int(end)
+                if begin <= pos < end and (inner is None or end-begin < size):
+                    inner, size = child, end-begin
+            if inner is None:
+                return node
+            node = inner
+
+    def _first(self, node, pos):
+        ''' The first node under node, in document order, beginning at pos '''
+        #Some leaves get an empty span at the end of their entry, so a 
+        #subtree is searched when pos is anywhere up to its end.
+        stack = [node.iterchildren()]
+        while stack:
+            for child in stack[-1]:
+                span = child.get('span')
+                if span is None:
+                    continue
+                begin, _, end = span.partition('~')
+                begin, end = int(begin), int(end)
+                if begin == pos:
+                    return child
+                if begin <= pos <= end:
+                    stack.append(child.iterchildren())
+                    break
+            else:
+                stack.pop()
+        return None
+
+    def startingAt(self, pos):
+        ''' The outermost node whose span begins at pos, or None '''
+        i = bisect_left(self.begins, pos)
+        if i < len(self.begins) and self.begins[i] == pos:
+            node = self.nodes[i]
+            if self._valid(node):
+                if node.span[0] == pos:
+                    return node
+                self.stale = True
+        node = self._top(pos)
+        if node is None:
+            return None
+        return self._first(node, pos)
+
+    def covering(self, pos):
+        ''' The innermost node whose span covers pos, or None '''
+        node = self._top(pos)
+        if node is None:
+            return None
+        return self._down(node, pos)
+
 #leaf
 class PDFString(PDFXML):
     def from_python(self, value):
@@ -61,7 +204,12 @@ class PDFString(PDFXML):
         return self.text.decode('string_escape')
     
 class PDFName(PDFString):
-    pass
+    def from_python(self, value):
+        PDFString.from_python(self, value)
+        #A renamed key, the entry index of the dictionary is no longer right
+        entry = self.getparent()
+        if entry is not None and entry.tag == 'entry':
+            entry._dropindex()
     
 class PDFData(PDFString):
     pass
@@ -92,7 +240,7 @@ class PDFR(PDFString):
 
     def solve(self):
         ''' search the referenced indirect object in the containing pdf '''
-        pdf = self.xpath('/*')[0]
+        pdf = self.getroottree().getroot()
         return pdf.getIndirectObject(self.value)
         
 class PDFNumber(PDFXML):
@@ -124,8 +272,15 @@ class PDFEntry(PDFXML):
     def _setkey(self, key):
         assert key.tag == 'name'
         self[0] = key
+        self._dropindex()
     key = property(_getkey,_setkey,None)
 
+    def _dropindex(self):
+        ''' Drop the entry index of the dictionary holding this entry '''
+        dictionary = self.getparent()
+        if dictionary is not None and dictionary.tag == 'dictionary':
+            dictionary._dropindex()
+
     def _getval(self):
         return self[1]
     def _setval(self, val):
@@ -137,20 +292,78 @@ class PDFDictionary(PDFXML):
     def to_python(self):
         return dict([e.value for e in self.getchildren()])
 
+    def _getindex(self):
+        ''' key -> (entry, escaped name). Kept on this proxy like the
+            object index of PDFUpdate, so it is only a hint: see _entry '''
+        hint = self.__dict__.get('_index')
+        if hint is None:
+            entries = list(self.iterchildren('entry'))
+            #On repeated keys the first one wins, as with the old xpath
+            entries.reverse()
+            index = {}
+            for entry in entries:
+                text = entry[0].text or ''
+                index[text.decode('string_escape')] = (entry, text)
+            hint = (self._signature(), index)
+            self._index = hint
+        return hint[1]
+    def _dropindex(self):
+        self.__dict__.pop('_index', None)
+
+    def _walk(self, key):
+        ''' The entry whose name is key, or None, without the index '''
+        text = key.encode('string_escape')
+        for entry in self.iterchildren('entry'):
+            if entry[0].text == text:
+                return entry
+        return None
+
+    def _entry(self, key):
+        ''' The entry whose name is key, or None '''
+        #Many proxies live for a single lookup (io.object['Length']), the
+        #index is built when the same proxy is asked a second time
+        if '_index' not in self.__dict__ and not self.__dict__.get('_asked'):
+            self._asked = True
+            return self._walk(key)
+        found = self._getindex().get(key)
+        if found is not None:
+            entry, text = found
+            if entry.getparent() is self and (entry[0].text or '') == text:
+                return entry
+        elif self._index[0] == self._signature():
+            #Nothing was added or removed since, a miss is still a miss
+            return None
+        #A stale hit, or entries were added or removed with plain lxml
+        #calls. Look again in a fresh index.
+        self._dropindex()
+        found = self._getindex().get(key)
+        if found is None:
+            return None
+        return found[0]
+    def _getentry(self, key):
+        entry = self._entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
     def has_key(self,key):
-        return len(self.xpath('./entry/name[position()=1 and text()="%s"]'%key))>0
+        return self._entry(key) is not None
     def __getitem__(self, i):
         if str == type(i):
-            return self.xpath('./entry/name[position()=1 and text()="%s"]/../*[position()=2]'%i)[0]
+            return self._getentry(i)[1]
         return super(PDFDictionary,self).__getitem__(i)
     def __delitem__(self, i):
         if str == type(i):
-            return self.remove(self.xpath('./entry/name[position()=1 and text()="%s"]/..'%i)[0])
+            self.remove(self._getentry(i))
+            self._dropindex()
+            return
+        self._dropindex()
         return super(PDFDictionary,self).__delitem__(i)
     def __setitem__(self, key, val):
         if str == type(key):
-            self.xpath('./entry/name[position()=1 and text()="%s"]/..'%key)[0].val=val
+            self._getentry(key).val=val
         else:
+            self._dropindex()
             super(PDFDictionary,self).__setitem__(key,val)
     
 
@@ -248,7 +461,8 @@ class PDFStream(PDFXML):
             while self.isFiltered():
                 self.popFilter()
         except Exception,e:
-            logger.debug("Couldn't defilter <%s> stream (exception %s)."%(self.value,str(e)))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Couldn't defilter <%s> stream (exception %s).", self.value, e)
             logger.info("Couldn't defilter <%s> stream."%str(self.get_numgen()))
 
     def isObjStm(self):
@@ -260,25 +474,20 @@ class PDFStream(PDFXML):
             This parses the ObjStm structure and replace it with all the new 
             indirect objects.
         '''
-        from opaflib.parser import parse
+        from opaflib.parser import parseObjStm
         assert not self.isFiltered(), "ObjStm should not be compressed at this point"
         assert self.dictionary.has_key('N'), "N is mandatory in ObjStm dictionary"
         assert self.dictionary.has_key('First'), "First is mandatory in ObjStm dictionary"
 
-
-        dictionary = self.dictionary
-        data = self.data.value
-        first = dictionary["First"].value
-        pointers =  [int(x) for x in data[:first].split()]
-        assert len(pointers)%2 == 0 , "Wrong number of integer in the ObjStm begining"
-        pointers = dict([(pointers[i+1]+first,pointers[i]) for i in range(0,len(pointers),2) ])
-        positions = sorted(pointers.keys() + [len(data)])
-        
+        #Spans of the new objects are offsets in the decoded stream, objstm
+        #says which stream they come from
+        container = self.getparent() is not None and self.getparent().get('id') or None
         parsed_objects = []
-        for p in range(0,len(positions)-1):
-            logger.info("Adding new object %s from objectstream"%repr((pointers[positions[p]],0)))
-            io = PDF.indirect_object(parse('object', data[positions[p]:positions[p+1]]+" "))
-            io.id = (pointers[positions[p]],0)
+        for number, xml in parseObjStm(self.data.value, self.dictionary["First"].value):
+            logger.info("Adding new object %r from objectstream", (number,0))
+            io = PDF.indirect_object([xml], span=xml.span, id="%d 0"%number)
+            if container is not None:
+                io.set('objstm', container)
             parsed_objects.append(io)
         return parsed_objects
 
@@ -303,6 +512,10 @@ class PDFIndirect(PDFXML):
         return tuple([int(i) for i in self.get('id').split(' ')])
     def _setid(self, o):
         self.set('id', "%d %d"%o)
+        #Renumbered, the object index of the update is no longer right
+        update = self.getparent()
+        if update is not None and update.tag == 'pdf_update':
+            update._dropindex()
     id = property(_getid,_setid,None)
     
     def isStream(self):
@@ -319,7 +532,17 @@ class PDFPdf(PDFXML):
     #FIX move all this to pdf_update and do the wrapper here
     def getObjectAt(self, pos):
         ''' Get the object found at certain byte position '''
-        return self.xpath('//*[starts-with(@span,"%d~")]'%pos)[0]
+        if self.get('span') is not None and self.span[0] == pos:
+            return self
+        node = self._spanindex('startingAt', pos)
+        if node is None:
+            raise IndexError("No object at %d"%pos)
+        return node
+
+    def getObjectCovering(self, pos):
+        ''' Get the innermost object that contains the byte at pos, or None
+            (use get_numgen() on it to know the indirect object) '''
+        return self._spanindex('covering', pos)
 
     def getTrailer(self, startxref=None):
         ''' Get the Trailer dictionary (should be at least one) '''
@@ -337,11 +560,20 @@ class PDFPdf(PDFXML):
         else:
             return ['','']
      
+    def _getupdates(self):
+        ''' The pdf_update children, newest first. Kept on this proxy so
+            their proxies, and the object indexes on them, stay alive. '''
+        self._updates = list(self.iterchildren('pdf_update', reversed=True))
+        return self._updates
+
     def getIndirectObject(self, ref):
-        ''' Search for an indirect object '''
-        for u in self.pdf_update:
-            if u.has_key(ref):
-                return u[ref]
+        ''' Search for an indirect object. A later update overrides the 
+            objects of the previous ones. '''
+        for u in self._getupdates():
+            io = u.getIndirectObject(ref)
+            if io is not None:
+                return io
+        return None
         
     def getRoot(self):
         ''' Get the pdf Root node. '''
@@ -553,28 +785,70 @@ class PDFUpdate(PDFXML):
     def to_python(self):
         return dict([e.value for e in self.xpath('./indirect_object')])
 
+    def _getindex(self):
+        ''' (num,gen) -> indirect_object of this update. It is kept on
+            this proxy, which may be thrown away and rebuilt at any time, 
+            and lxml edits do not tell us about it. So it is only a hint:
+            see getIndirectObject. '''
+        hint = self.__dict__.get('_index')
+        if hint is None:
+            objects = list(self.iterchildren('indirect_object'))
+            #On repeated ids the first one wins, as with the old xpath
+            objects.reverse()
+            hint = (self._signature(), dict([(io.id, io) for io in objects]))
+            self._index = hint
+        return hint[1]
+    def _dropindex(self):
+        self.__dict__.pop('_index', None)
+
+    def getIndirectObject(self, ref):
+        ''' The indirect object ref of this update, or None '''
+        io = self._getindex().get(ref)
+        if io is not None:
+            if io.getparent() is self and io.get('id') == "%d %d"%ref:
+                return io
+        elif self._index[0] == self._signature():
+            #Nothing was added or removed since, a miss is still a miss
+            return None
+        #A stale hit, or objects were inserted or removed with plain lxml 
+        #calls. Look again in a fresh index.
+        self._dropindex()
+        return self._getindex().get(ref)
+
     def has_key(self,key):
-        key = "%d %d"%key
-        return len(self.xpath('./indirect_object[@id="%s"]'%key))>0
+        return self.getIndirectObject(key) is not None
     def __getitem__(self, key):
         if tuple == type(key):
-            key = "%d %d"%key
-            return self.xpath('./indirect_object[@id="%s"]'%key)[0]
+            io = self.getIndirectObject(key)
+            if io is None:
+                raise KeyError(key)
+            return io
         return super(PDFUpdate,self).__getitem__(key)
     def __delitem__(self, key):
         if tuple == type(key):
-            key = "%d %d"%key
-            return self.remove(self.xpath('./indirect_object[@id="%s"]'%key)[0])
+            self.remove(self[key])
+            self._dropindex()
+            return
+        self._dropindex()
         return super(PDFUpdate,self).__delitem__(key)
     def __setitem__(self, key, val):
-        if str == type(key):
-            self.xpath('./indirect_object[@obj="%s"]'%key)[0][:]=[val] #mmm
+        if tuple == type(key):
+            self[key][:]=[val]
         else:
-            super(PDFDictionary,self).__setitem__(key,val)
+            self._dropindex()
+            super(PDFUpdate,self).__setitem__(key,val)
     
     def getObjectAt(self, pos):
         ''' Get the object found at certain byte position (only in this update!)'''
-        return self.xpath('.//*[starts-with(@span,"%d~")]'%pos)[0]
+        node = self._spanindex('startingAt', pos)
+        if node is None:
+            raise IndexError("No object at %d"%pos)
+        return node
+
+    def getObjectCovering(self, pos):
+        ''' Get the innermost object that contains the byte at pos, or None
+            (only in this update!)'''
+        return self._spanindex('covering', pos)
 
     def getTrailer(self, startxref=None):
         ''' Get the Trailer dictionary (of this update!)'''
@@ -602,10 +876,11 @@ class PDFUpdate(PDFXML):
         #parse the indirect simpe objects  inside it
         expanded_iobjects = io_objstm.object.expandObjStm()
 
-        #replace the object stream by its childs
-        for new_io in expanded_iobjects:
+        #replace the object stream by its childs, in stream order
+        for new_io in reversed(expanded_iobjects):
             io_objstm.addnext(new_io)
         self.remove(io_objstm)
+        self._dropindex()
     
     def findAllObjStm(self):
         ''' Search  'compressed' object streams ids/refs'''
@@ -640,14 +915,19 @@ class PDFXMLFactory():
         namespace['indirect_object'] = PDFIndirect
         namespace['array'] = PDFArray
         self.parser.set_element_class_lookup(lookup)
+        #Nodes created so far, the parser budgets count them
+        self.nodes = 0
 
     #leaf
     def create_leaf(self, tag, value,**attribs):
         assert tag in ['number','string','name','R','startxref','header','data','null','bool'], "Got wrong leaf tag: %s"%tag
+        self.nodes += 1
         xml = self.parser.makeelement(tag)
         xml.value=value
-        xml.span=attribs.setdefault('span', (0xffffffff,-1))
-        del attribs['span']
+        #span=None leaves the node without a span attribute
+        span = attribs.pop('span', (0xffffffff,-1))
+        if span is not None:
+            xml.set('span',"%d~%d"%span)
         for attr_key, attr_val in attribs.items():
             xml.set(attr_key, str(attr_val))
         return xml
@@ -655,9 +935,12 @@ class PDFXMLFactory():
     #Tree
     def create_tree(self, tag, *childs, **attribs):
         assert tag in ['indirect_object','dictionary', 'entry', 'array', 'stream', 'xref', 'pdf', 'pdf_update'], "Got wrong tree tag: %s"%tag
+        self.nodes += 1
         xml = self.parser.makeelement(tag)
-        xml.span=attribs.setdefault('span', (0xffffffff,-1))
-        del attribs['span']
+        #span=None leaves the node without a span attribute
+        span = attribs.pop('span', (0xffffffff,-1))
+        if span is not None:
+            xml.set('span',"%d~%d"%span)
         for attr_key, attr_val in attribs.items():
             xml.set(attr_key, str(attr_val))
         for child in childs:
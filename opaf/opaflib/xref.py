@@ -1,5 +1,6 @@
 import StringIO
 from opaflib import *
+from opaflib.lexer import XrefTable
 ####
 #### XrefStm
 ####
@@ -129,27 +130,26 @@ def decodeXrefStm(xml_pdf,xrefstm):
 def decodeXref(xml_pdf,xref):    
     '''
         This will decode a NORMAL Xref.
-        #TODO: this is done by the lexer... move it here?
+        The lexer keeps the table text in the xref data (or in the xref
+        attribute when brute parsed), it is read back in bulk by XrefTable.
     '''
     assert xref.tag == "xref", "Type must by xref (And it is %s)"%xref.tag
     
     #get the trailer dictionary
-    xref_dict = xmlToPy(xref[0])
+    xref_dict = xref[0].value
     
     referenced, compressed, deleted = {}, {}, []
-    subsections = eval(payload(xref)) #safe lazyness because we parse it in the lexer
-    for subsection in subsections:
-        (start,size), entries = subsection
-        assert size == len(entries), "Subsection length should be %d and it is %d"%(size,len(subsection))
+    table, end = XrefTable.read(xref.get('xref', None) or xref[1].value)
+    for start, size, offsets, gens, used in table.subsections:
+        assert size == len(offsets), "Subsection length should be %d and it is %d"%(size,len(offsets))
         #TODO Check reference order, overlap and freelist
-        for i in range(0,len(entries)):
-            pos, gen, ty = entries[i]
-            ref = repr((start+i,gen))
-            if ty == 'f':
+        for i in xrange(size):
+            ref = repr((start+i,gens[i]))
+            if used[i]:
+                referenced[ref] = offsets[i]
+            else:
                 deleted.append(ref)
-            elif ty == 'n':
-                referenced[ref] = pos
-        return referenced, compressed, deleted, xref_dict.get('Prev',None)
+    return referenced, compressed, deleted, xref_dict.get('Prev',None)
 
 
 def checkXrefTree(xml_pdf):
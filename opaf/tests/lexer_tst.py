@@ -1,5 +1,7 @@
 import unittest
+import tempfile
 from opaflib.lexer import PDFLexer
+from opaflib.parser import mapFile
 import ply.lex as lex
 
 class ParserTest(unittest.TestCase):
@@ -22,11 +24,43 @@ class ParserTest(unittest.TestCase):
         (r"[LexToken(HEXSTRING,'',1,0)]","<>"),
         (r"[LexToken(HEXSTRING,'\x01\x02\x03\x04',1,0)]","<01020304>"),
         (r"[LexToken(STRING,'!',1,2)]","(!)"),
+        (r"[LexToken(STRING,'a (nested) string',1,18)]","(a (nested) string)"),
+        (r"[LexToken(STRING,'line\nnext) A',1,17)]","(line\nnext\\) \\101)"),
+        (r"[LexToken(STRING,'acontinued',1,13)]","(a\\\ncontinued)"),
         (r"[LexToken(NUMBER,'123.2',1,0)]", '123.2'),
-        (r"[LexToken(NAME,'name0',1,0)]", '/name0')]
+        (r"[LexToken(NAME,'name0',1,0)]", '/name0'),
+        (r"[LexToken(NAME,'aABc',1,0), LexToken(NAME,'#4',1,9)]", '/a#41#42c/#4'),
+        (r"[LexToken(NAME,'',1,0), LexToken(LEFT_SQUARE_BRACKET,'[',1,1)]", '/[')]
         for token, string  in tst:
             self.assertEqual(token, self.lex(string))
 
+    def testXrefTable(self):
+        table = "0 2\n0000000000 65535 f \n0000000010 00000 n \n7 1\r\n0000000020 00001 n\r\n"
+        tokens = self.my_lexer.lexify("xref\n" + table + "trailer")
+        self.assertEqual(['XREF', 'TRAILER'], [tok.type for tok in tokens])
+        self.assertEqual(table, str(tokens[0].value))
+        self.assertEqual([(0, 2, [0, 10], [65535, 0], [0, 1]), (7, 1, [20], [1], [1])],
+                         [(first, size, list(offsets), list(gens), list(used))
+                          for first, size, offsets, gens, used in tokens[0].value.subsections])
+
+    def testItertokens(self):
+        data = "1 0 obj\n<< /Type /Page /Kids [2 0 R 3 0 R] >>\nendobj\n"
+        tokens = self.my_lexer.itertokens(data)
+        self.assertEqual(iter(tokens), tokens)
+        self.assertEqual(self.lex(data), str(list(tokens)))
+
+    def testMappedInput(self):
+        data = "1 0 obj\n<< /Length 4 /Kids [2 0 R] >>\nstream\nABCD\nendstream\nendobj\n"
+        f = tempfile.NamedTemporaryFile()
+        f.write(data)
+        f.flush()
+        self.assertEqual(self.lex(data), self.lex(mapFile(f.name)))
+        f.close()
+        #An empty file can not be mapped
+        f = tempfile.NamedTemporaryFile()
+        self.assertEqual('', mapFile(f.name))
+        f.close()
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -63,7 +63,558 @@ class ParserTest(unittest.TestCase):
             self.assertEqual(tag, parser.parse('object', obj_str).tag)
 
 
-        
+    def testParseTokens(self):
+        from opaflib.lexer import PDFLexer
+        lexer = PDFLexer()
+        lexer.build()
+        obj_str = '<< /entry1 1 /entry2 [(string) 1 0 R] >>'
+        xml = parser.parseTokens('object', lexer.itertokens(obj_str))
+        self.assertEqual(parser.parse('object', obj_str).xml, xml.xml)
+
+    def testUseLength(self):
+        obj_str = '1 0 obj\n<< /Length 20 >>\nstream\nAAendstream\nBBBBBBB\nendstream\nendobj\n'
+        self.assertRaises(Exception, parser.parse, 'indirect', obj_str)
+        for backend in parser.backends.keys():
+            xml = parser.parse('indirect', obj_str, backend, use_length=True)
+            self.assertEqual('AAendstream\nBBBBBBB\n', xml.object.data.value)
+        #Wrong /Length falls back to search the endstream keyword
+        obj_str = '1 0 obj\n<< /Length 2 /Sub << /Length 9 >> >>\nstream\nAAAA\nendstream\nendobj\n'
+        xml = parser.parse('indirect', obj_str, use_length=True)
+        self.assertEqual('AAAA\n', xml.object.data.value)
+        #And so does a real one
+        obj_str = '1 0 obj\n<< /Length 4.5 >>\nstream\nAAAA\nendstream\nendobj\n'
+        for backend in parser.backends.keys():
+            xml = parser.parse('indirect', obj_str, backend, use_length=True)
+            self.assertEqual('AAAA\n', xml.object.data.value)
+
+    def testParserTables(self):
+        import StringIO
+        import ply.yacc as yacc
+        #The shipped tables must match the grammar or PLY rebuilds them
+        for tag in parser.starts:
+            log = StringIO.StringIO()
+            yacc.yacc(module=parser, start=tag, tabmodule='opaflib.parsetab_%s'%tag,
+                      write_tables=0, debug=False, errorlog=yacc.PlyLogger(log))
+            self.assertEqual('', log.getvalue(), tag)
+        self.assertRaises(KeyError, parser.parsers.__getitem__, 'nonexistent')
+
+    def testLazyImports(self):
+        import sys, os, subprocess
+        #Slow imports only paid for by the runs that use them
+        here = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        check = "import sys; from opaflib import parser; parser.parse('object', '[1]'); print sorted(set(%r).intersection(sys.modules))"
+        modules = ['opaflib.scanner', 'multiprocessing']
+        out = subprocess.Popen([sys.executable, '-c', check%modules], cwd=here, stdout=subprocess.PIPE).communicate()[0]
+        self.assertEqual('[]', out.strip())
+        self.assertEqual('PDFScanner', parser.backends['fast'].__name__)
+
+    def testLexerClone(self):
+        from opaflib.lexer import PDFLexer
+        first, second = PDFLexer(), PDFLexer()
+        first.build()
+        second.build()
+        #Unterminated string in one lexer does not leak into the other
+        first.input('(abc')
+        first.token()
+        self.assertEqual(['NUMBER'], [t.type for t in second.lexify('1')])
+        self.assertEqual(['STRING'], [t.type for t in first.lexify('(x)')])
+
+    def testParserSession(self):
+        objs = ['<< /A 1 >>', '[1 2 0 R (x)]', '(string)', '/Name']
+        for backend in parser.backends.keys():
+            session = parser.ParserSession('object', backend)
+            for obj_str in objs:
+                self.assertEqual(parser.parse('object', obj_str).xml, session.parse(obj_str).xml)
+            #A failed parse does not spoil the session
+            self.assertRaises(Exception, session.parse, '[ <asd> ]')
+            self.assertEqual(None, session.parse('(asd'))
+            self.assertEqual(parser.parse('object', objs[0]).xml, session.parse(objs[0]).xml)
+        #Error counts and handlers are per session
+        strict, lenient = parser.ParserSession('object'), parser.ParserSession('object')
+        strict.raise_errors = True
+        self.assertEqual(None, lenient.parse('<< /A 1 1 >>'))
+        self.assertEqual(1, lenient.errors)
+        self.assertEqual(parser.parse('object', objs[0]).xml, strict.parse(objs[0]).xml)
+        self.assertEqual((0, 1), (strict.errors, lenient.errors))
+        self.assertRaises(parser.ParserSession.SyntaxError, strict.parse, '<< /A 1 1 >>')
+        self.assertEqual(None, lenient.parse('<< /A 1 1 >>'))
+        self.assertEqual(parser.p_error, parser.parsers['object'].errorfunc)
+
+    def testListOrder(self):
+        xml = parser.parse('object', '[ 1 [ 2 3 ] [ ] 4 ]')
+        self.assertEqual([1, [2, 3], [], 4], xml.value)
+        xml = parser.parse('object', '<< /A 1 /B [ 2 ] /A 3 >>')
+        self.assertEqual(['A', 'B', 'A'], [e[0].value for e in xml])
+        n = 5000
+        xml = parser.parse('object', '[ %s ]'%' '.join([str(i) for i in range(n)]))
+        self.assertEqual(range(n), xml.value)
+
+    def testParseObjStm(self):
+        objs = ['<< /A 1 /B [ 2 3 ] >>', '(str)', '15', '[ /x 4 0 R ]']
+        body = ''
+        table = []
+        for i, obj in enumerate(objs):
+            table += [10+i, len(body)]
+            body += obj + '\n'
+        #The table does not need to be in offset order
+        head = ' '.join([str(x) for x in table[2:] + table[:2]]) + ' '
+        data = head + body
+        for backend in parser.backends.keys():
+            objects = parser.parseObjStm(data, len(head), backend)
+            self.assertEqual([11, 12, 13, 10], [number for number, xml in objects])
+            for number, xml in objects:
+                obj = objs[number-10]
+                expected = parser.parse('object', obj)
+                expected.span_move(len(head)+body.index(obj))
+                self.assertEqual(expected.xml, xml.xml)
+        self.assertRaises(AssertionError, parser.parseObjStm, '10 0 11 3 12', 10)
+        self.assertRaises(AssertionError, parser.parseObjStm, '10 0 11 3 1 2 3', 10)
+        #Offsets are checked, not only their order
+        self.assertRaises(AssertionError, parser.parseObjStm, '10 0 11 2 [1 2] (x)', 10)
+        #An object not in the table is skipped, the rest parsed one by one
+        body = '(pad) [1 ] %c\n<</A 1>>'
+        padded = '10 %d 11 %d '%(body.index('['), body.index('%')) + body
+        for backend in parser.backends.keys():
+            objects = parser.parseObjStm(padded, len(padded)-len(body), backend)
+            self.assertEqual([(10, [1]), (11, {'A': 1})], [(number, xml.value) for number, xml in objects])
+            self.assertEqual([padded.index('['), padded.index('<<')], [xml.span[0] for number, xml in objects])
+        #Expanded in place, in stream order and marked with their ObjStm
+        pdf = '%%PDF-1.5\n7 0 obj\n<< /Type /ObjStm /N 4 /First %d /Length %d >>\nstream\n%s\nendstream\nendobj\n'%(len(head), len(data), data)
+        pdf += 'xref\n0 1\n0000000000 65535 f \ntrailer\n<< /Size 1 >>\nstartxref\n0\n%%EOF\n'
+        xml = parser.normalParser(pdf)
+        xml[1].expandObjStm((7,0))
+        self.assertEqual(['11 0', '12 0', '13 0', '10 0'], [o.get('id') for o in xml.xpath('//indirect_object')])
+        self.assertEqual(['7 0']*4, [o.get('objstm') for o in xml.xpath('//indirect_object')])
+        self.assertEqual(((11, 0), 'str'), xml.xpath('//indirect_object')[0].value)
+
+    def testSpans(self):
+        from lxml import etree
+        pdf = self.samplePdf(3, 2, xref_stream=True)
+        full = parser.normalParser(pdf)
+        objects = parser.normalParser(pdf, spans='objects')
+        none = parser.normalParser(pdf, spans='none')
+        self.assertEqual([], none.xpath('//*[@span]'))
+        top = ['header', 'indirect_object', 'xref', 'startxref', 'pdf_update', 'pdf']
+        self.assertEqual([(e.tag, e.span) for e in full.iter() if e.tag in top],
+                         [(e.tag, e.span) for e in objects.iter() if e.get('span')])
+        full.clear_span()
+        objects.clear_span()
+        self.assertEqual(etree.tostring(full), etree.tostring(objects))
+        self.assertEqual(etree.tostring(full), etree.tostring(none))
+        self.assertEqual(None, parser.parse('object', '<< /A [ 1 ] >>', spans='none').get('span'))
+        self.assertRaises(AssertionError, parser.ParserSession, 'object', spans='some')
+
+    def testChildAttributes(self):
+        xml = parser.normalParser(self.samplePdf(3, 2))
+        self.assertEqual(xml.xpath('./pdf_update'), xml.pdf_update)
+        self.assertEqual(xml.xpath('./pdf_update[2]/startxref'), xml.pdf_update[-1].startxref)
+        io = xml.pdf_update[0].indirect_object[0]
+        self.assertEqual([io[0]], getattr(io, io[0].tag))
+        self.assertFalse(hasattr(xml, 'indirect_object'))
+        self.assertRaises(AttributeError, getattr, io, 'nothing')
+        xml.remove(xml.pdf_update[-1])
+        self.assertEqual(1, len(xml.pdf_update))
+
+    def testDictionaryKeys(self):
+        d = parser.parse('object', '<< /Type /XObject /A"B 1 /Length 2 >>')
+        self.assertTrue(d.has_key('Type'))
+        self.assertTrue(d.has_key('A"B'))
+        self.assertFalse(d.has_key('Missing'))
+        self.assertEqual('XObject', d['Type'].value)
+        self.assertEqual(1, d['A"B'].value)
+        self.assertRaises(KeyError, d.__getitem__, 'Missing')
+        d['Length'] = parser.parse('object', '7')
+        self.assertEqual(7, d['Length'].value)
+        del d['A"B']
+        self.assertEqual({'Type': 'XObject', 'Length': 7}, d.value)
+        self.assertEqual('Type', d[0][0].value)
+        #Misses in an unchanged dictionary keep its entry index
+        self.assertTrue(d.has_key('Type'))
+        index = d.__dict__['_index']
+        self.assertFalse(d.has_key('Missing'))
+        self.assertTrue(index is d.__dict__['_index'])
+        #Entries added, renamed or replaced after the index was built
+        d.append(parser.parse('object', '<< /Filter /FlateDecode >>')[0])
+        self.assertEqual('FlateDecode', d['Filter'].value)
+        d[0].addnext(parser.parse('object', '<< /Subtype /Image >>')[0])
+        self.assertEqual('Image', d['Subtype'].value)
+        d[0][0].value = 'Kind'
+        self.assertFalse(d.has_key('Type'))
+        self.assertEqual('XObject', d['Kind'].value)
+        d[-1].key = parser.parse('object', '/Filter2')
+        self.assertFalse(d.has_key('Filter'))
+        self.assertEqual('FlateDecode', d['Filter2'].value)
+        self.assertEqual(['Kind', 'Subtype', 'Length', 'Filter2'], [e[0].value for e in d])
+
+    def testIndirectObjects(self):
+        #The second update redefines object 1
+        xml = parser.normalParser(self.samplePdf(2, 2).replace('3 0 obj', '1 0 obj'))
+        first, second = xml.pdf_update
+        self.assertEqual(1, first[(1,0)].object['Index'].value)
+        self.assertEqual(3, second[(1,0)].object['Index'].value)
+        self.assertEqual(3, xml.getIndirectObject((1,0)).object['Index'].value)
+        self.assertEqual(2, xml.getIndirectObject((2,0)).object['Index'].value)
+        self.assertEqual(None, xml.getIndirectObject((7,0)))
+        self.assertFalse(second.has_key((2,0)))
+        self.assertRaises(KeyError, second.__getitem__, (2,0))
+        #References solve through the index
+        self.assertEqual(2, first[(1,0)].object['Next'].solve().object['Index'].value)
+        #Changes made through lxml calls are noticed too
+        del second[(1,0)]
+        self.assertEqual(1, xml.getIndirectObject((1,0)).object['Index'].value)
+        first.remove(first[(2,0)])
+        self.assertEqual(None, xml.getIndirectObject((2,0)))
+        moved = second[(4,0)]
+        moved.id = (9,0)
+        self.assertEqual(None, xml.getIndirectObject((4,0)))
+        first.append(moved)
+        self.assertEqual(moved, xml.getIndirectObject((9,0)))
+        self.assertEqual(first, moved.getparent())
+
+    def testIndirectObjectsEdits(self):
+        #Objects added in the middle or renumbered after the index is built
+        for pdf in [self.samplePdf(3), self.samplePdf(3, 2)]:
+            xml = parser.normalParser(pdf)
+            u = xml.pdf_update[0]
+            self.assertTrue(u.has_key((1,0)))
+            self.assertEqual(None, xml.getIndirectObject((9,0)))
+            #Before the xref
+            io = parser.parse('indirect', '9 0 obj\n(nine)\nendobj\n')
+            u.insert(0, io)
+            self.assertTrue(u.has_key((9,0)))
+            self.assertEqual(io, xml.getIndirectObject((9,0)))
+            io = parser.parse('indirect', '8 0 obj\n(eight)\nendobj\n')
+            u[(1,0)].addnext(io)
+            self.assertEqual(io, u.getIndirectObject((8,0)))
+            self.assertEqual(io, xml.getIndirectObject((8,0)))
+            u[(2,0)].id = (7,0)
+            self.assertEqual((7,0), u[(7,0)].id)
+            self.assertEqual((7,0), xml.getIndirectObject((7,0)).id)
+            self.assertFalse(u.has_key((2,0)))
+            self.assertEqual(None, xml.getIndirectObject((2,0)))
+        #A newer update redefining an object overrides it
+        xml = parser.normalParser(self.samplePdf(3, 2))
+        self.assertEqual(1, xml.getIndirectObject((1,0)).object['Index'].value)
+        io = parser.parse('indirect', '1 0 obj\n<< /Index 99 >>\nendobj\n')
+        xml.pdf_update[-1].insert(0, io)
+        self.assertEqual(io, xml.getIndirectObject((1,0)))
+        xml.pdf_update[-1].remove(io)
+        self.assertEqual(1, xml.getIndirectObject((1,0)).object['Index'].value)
+        #Misses in unchanged updates do not rebuild their indexes
+        indexes = [u.__dict__['_index'] for u in xml._getupdates()]
+        self.assertEqual(None, xml.getIndirectObject((50,0)))
+        self.assertTrue(all([a is b for a, b in zip(indexes, [u.__dict__['_index'] for u in xml._getupdates()])]))
+
+    def testObjectAt(self):
+        pdf = self.samplePdf(3, 2)
+        xml = parser.normalParser(pdf)
+        update = xml.pdf_update[1]
+        for pos in range(len(pdf)+1):
+            #Same answers as the old xpath
+            for root, path in [(xml, '//*'), (update, './/*')]:
+                expected = root.xpath('%s[starts-with(@span,"%d~")]'%(path, pos))
+                if expected:
+                    self.assertEqual(expected[0], root.getObjectAt(pos))
+                else:
+                    self.assertRaises(IndexError, root.getObjectAt, pos)
+            #The innermost node covering pos, inside ancestors covering it too
+            covers = lambda e: e.span[0] <= pos < e.span[1]
+            covering = [e for e in xml.iter() if covers(e) and all(map(covers, e.iterancestors()))]
+            #Deepest first, then narrowest
+            covering.sort(key=lambda e: (len(list(e.iterancestors())), e.span[0]-e.span[1]))
+            self.assertEqual((covering or [None])[-1], xml.getObjectCovering(pos))
+        self.assertEqual('xref', xml.getObjectAt(xml.getStartxref().value).tag)
+        self.assertEqual((4,0), xml.getObjectCovering(pdf.index('/three', pdf.index('4 0 obj'))).get_numgen())
+        self.assertEqual(None, update.getObjectCovering(0))
+        #Misses in an unchanged tree do not rebuild the index
+        index = xml.__dict__['_spans']
+        self.assertRaises(IndexError, xml.getObjectAt, pdf.index('5 0 obj')+1)
+        self.assertEqual(None, xml.getObjectCovering(len(pdf)+10))
+        self.assertTrue(index is xml.__dict__['_spans'])
+        #Edits after the index was built
+        io = xml.getObjectAt(pdf.index('5 0 obj'))
+        update.remove(io)
+        self.assertRaises(IndexError, xml.getObjectAt, pdf.index('5 0 obj'))
+        io.span_move(len(pdf))
+        update.append(io)
+        self.assertEqual(io, xml.getObjectAt(pdf.index('5 0 obj')+len(pdf)))
+        self.assertFalse(index is xml.__dict__['_spans'])
+
+    def testSpanMove(self):
+        xml = parser.parse('object', '<< /A [ 1 ] >>')
+        spans = [e.span for e in xml.iter()]
+        xml.span_move(100)
+        self.assertEqual([(b+100, e+100) for b, e in spans], [e.span for e in xml.iter()])
+        xml.span_move(-100, recursive=False)
+        self.assertEqual(spans[0], xml.span)
+        self.assertEqual((spans[1][0]+100, spans[1][1]+100), xml[0].span)
+        #Nodes without a span are skipped
+        pdf = self.samplePdf(2, 1)
+        objects = parser.normalParser(pdf, spans='objects')
+        expected = [(e.tag, e.get('span') and (e.span[0]+7, e.span[1]+7)) for e in objects.iter()]
+        objects.span_move(7)
+        self.assertEqual(expected, [(e.tag, e.get('span') and e.span) for e in objects.iter()])
+        objects.clear_span(recursive=False)
+        self.assertEqual(None, objects.get('span'))
+        self.assertNotEqual([], objects.xpath('//*[@span]'))
+
+    def testParseEvents(self):
+        class Recorder(parser.PDFHandler):
+            def __init__(self):
+                self.events = []
+            def startObject(self, ref, span): self.events.append(('startObject', ref, span))
+            def endObject(self, ref, span): self.events.append(('endObject', ref, span))
+            def startEntry(self, key, span): self.events.append(('startEntry', key, span))
+            def endEntry(self, key, span): self.events.append(('endEntry', key, span))
+            def reference(self, ref, span): self.events.append(('reference', ref, span))
+            def stream(self, data, span): self.events.append(('stream', data, span))
+            def value(self, tag, value, span): self.events.append((tag, value, span))
+        pdf = '1 0 obj\n<< /A [(x)] /B 2 0 R >>\nendobj\n2 0 obj\n<< >>\nstream\nAB\nendstream\nendobj\n'
+        expected = [('startObject', (1,0), (0,7)),
+                    ('startEntry', 'A', (11,13)), ('string', 'x', (15,18)), ('endEntry', 'A', (11,19)),
+                    ('startEntry', 'B', (20,22)), ('reference', (2,0), (23,28)), ('endEntry', 'B', (20,28)),
+                    ('endObject', (1,0), (0,38)),
+                    ('startObject', (2,0), (39,46)),
+                    ('stream', 'AB\n', (53,72)),
+                    ('endObject', (2,0), (39,79))]
+        for backend in parser.backends.keys():
+            self.assertEqual(expected, parser.parseEvents(pdf, Recorder(), backend).events)
+        self.assertRaises(Exception, parser.parseEvents, '<< /A ]', parser.PDFHandler())
+
+    def testParseEventsTriage(self):
+        class Found(Exception):
+            pass
+        class Triage(parser.PDFHandler):
+            def startEntry(self, key, span):
+                if key in ['JavaScript', 'OpenAction']:
+                    raise Found(key)
+        pdf = '1 0 obj\n<< /Type /Catalog /OpenAction 2 0 R >>\nendobj\n'
+        self.assertRaises(Found, parser.parseEvents, pdf, Triage())
+        parser.parseEvents(pdf.replace('OpenAction', 'Pages'), Triage())
+
+    def samplePdf(self, objects, updates=1, xref_stream=False):
+        ''' A pdf with valid xref tables, the last update may use a xref stream '''
+        pdf = '%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'
+        number = 1
+        for update in range(updates):
+            offsets = []
+            for i in range(objects):
+                offsets.append(len(pdf))
+                pdf += '%d 0 obj\n<< /Index %d /Next %d 0 R /Kids [1 (two) /three] >>\nendobj\n'%(number, number, number+1)
+                number += 1
+            if xref_stream and update == updates-1:
+                startxref = len(pdf)
+                pdf += '%d 0 obj\n<< /Type /XRef /Length 4 >>\nstream\nABCD\nendstream\nendobj\n'%number
+            else:
+                startxref = len(pdf)
+                pdf += 'xref\n%d %d\n'%(number-objects, objects)
+                pdf += ''.join(['%010d 00000 n \n'%offset for offset in offsets])
+                pdf += 'trailer\n<< /Size %d >>\n'%number
+            pdf += 'startxref\n%d\n%%%%EOF\n'%startxref
+        return pdf
+
+    def testParallelParser(self):
+        stream = self.samplePdf(5).replace('<< /Index 3 /Next 4 0 R /Kids [1 (two) /three] >>',
+                                           '<< /Length 15 >>\nstream\n9 0 obj\nendobj\n\nendstream')
+        for pdf in [self.samplePdf(20), self.samplePdf(10, 3), self.samplePdf(10, 2, True),
+                    #Broken xref offsets, raw scan
+                    self.samplePdf(10).replace('\n1 0 obj', '\n 1 0 obj'),
+                    #The xref skips the object header inside the stream
+                    stream,
+                    #Without it the raw scan splits wrong, falls back to normalParser
+                    stream.replace('\n1 0 obj', '\n 1 0 obj')]:
+            expected = parser.normalParser(pdf).xml
+            self.assertEqual(expected, parser.parallelParser(pdf, 1).xml)
+            self.assertEqual(expected, parser.parallelParser(pdf, 3).xml)
+            for spans in ['objects', 'none']:
+                self.assertEqual(parser.normalParser(pdf, spans=spans).xml, parser.parallelParser(pdf, 2, spans=spans).xml)
+        self.assertEqual(None, parser.parallelParser('%PDF-1.4\n1 0 obj\n1\nendobj\n', 2))
+
+    def testBruteParser(self):
+        good = '1 0 obj\n<< /A 1 >>\nendobj\n'
+        broken = '2 0 obj\n<< /Broken ]\nstray endobj\n'
+        stream = '3 0 obj\n<< /Length 10 >>\nstream\n4 0 obj endobj\nendstream\nendobj\n'
+        end = 'xref\n0 1\n0000000000 65535 f \ntrailer\n<< /Size ] >>\nxref\n0 1\n0000000000 65535 f \ntrailer\n<< /Size 1 >>\nstartxref\n0\n%%EOF\n'
+        pdf = '%PDF-1.4\n' + good + broken + stream + end
+        xml = parser.bruteParser(pdf)
+        self.assertEqual(['1 0', '3 0'], [o.get('id') for o in xml.xpath('//indirect_object')])
+        #Spans are file offsets
+        offset = pdf.index(stream)
+        expected = parser.parse('indirect', stream)
+        expected.span_move(offset)
+        self.assertEqual(expected.xml, xml.xpath('//indirect_object')[1].xml)
+        self.assertEqual(1, len(xml.xpath('//xref')))
+        self.assertEqual((pdf.rindex('xref\n0 1'), pdf.index('startxref')-1), xml.xpath('//xref')[0].span)
+
+    def testBudget(self):
+        pdf = self.samplePdf(50)
+        full = parser.normalParser(pdf)
+        self.assertEqual(None, full.get('partial'))
+        #Each object is 14 tokens, the partial tree keeps the finished ones
+        budget = parser.Budget(tokens=14*10+5)
+        xml = parser.normalParser(pdf, budget=budget)
+        self.assertEqual('more than 145 tokens', budget.reason)
+        self.assertEqual(budget.reason, xml.get('partial'))
+        self.assertEqual([o.xml for o in full.xpath('//indirect_object')[:10]],
+                         [o.xml for o in xml.xpath('//indirect_object')])
+        self.assertEqual((0, full.xpath('//indirect_object')[9].span[1]), xml.span)
+        #Once exceeded any other parse stops right away
+        self.assertRaises(parser.Budget.Exceeded, parser.parse, 'object', '1', budget=budget)
+        budget = parser.Budget(depth=10)
+        deep = '%PDF-1.4\n1 0 obj\n<< >>\nendobj\n2 0 obj\n' + '['*1000 + '\nendobj\n'
+        xml = parser.multiParser(deep, budget=budget)
+        self.assertEqual('nesting deeper than 10 at %d'%(deep.index('[')+10), budget.reason)
+        self.assertEqual(['1 0'], [o.get('id') for o in xml.xpath('//indirect_object')])
+        budget = parser.Budget(nodes=100)
+        xml = parser.bruteParser(pdf, budget=budget)
+        self.assertEqual('more than 100 nodes', xml.get('partial'))
+        self.assertTrue(0 < len(xml.xpath('//indirect_object')) < 50)
+        budget = parser.Budget(nodes=100)
+        xml = parser.xrefParser(pdf, budget=budget)
+        self.assertEqual('more than 100 nodes', xml.get('partial'))
+        self.assertTrue(0 < len(xml.xpath('//indirect_object')) < 50)
+        budget = parser.Budget(seconds=0)
+        self.assertEqual(None, parser.normalParser(pdf, budget=budget))
+        self.assertEqual('more than 0 seconds', budget.reason)
+
+    def testXrefParser(self):
+        import zlib, struct
+        pdf = '%PDF-1.5\nJUNK ( [ <<\n'
+        offsets = {}
+        for n in [1, 2]:
+            offsets[n] = len(pdf)
+            pdf += '%d 0 obj\n<< /Version 1 >>\nendobj\nJUNK >> ]\n'%n
+        first = len(pdf)
+        pdf += 'xref\n0 3\n0000000000 65535 f \n%010d 00000 n \n%010d 00000 n \n'%(offsets[1], offsets[2])
+        #This /Prev points to its own table, the loop is cut
+        pdf += 'trailer\n<< /Size 3 /Prev %d >>\nstartxref\n%d\n%%%%EOF\n'%(first, first)
+        #Update object 2 with a compressed xref stream
+        offsets[2] = len(pdf)
+        pdf += '2 0 obj\n<< /Version 2 >>\nendobj\n'
+        data = zlib.compress(''.join([struct.pack('>BHB', 1, offsets[2], 0)]))
+        second = len(pdf)
+        pdf += '3 0 obj\n<< /Type /XRef /Size 4 /Index [2 1] /W [1 2 1] /Prev %d /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream\nendobj\n'%(first, len(data), data)
+        pdf += 'startxref\n%d\n%%%%EOF\n'%second
+        self.assertRaises(Exception, parser.normalParser, pdf)
+        xml = parser.xrefParser(pdf)
+        self.assertEqual(['header', 'pdf_update', 'pdf_update'], [e.tag for e in xml])
+        self.assertEqual(['indirect_object', 'xref', 'startxref'], [e.tag for e in xml[1]])
+        self.assertEqual(['indirect_object', 'indirect_object', 'startxref'], [e.tag for e in xml[2]])
+        self.assertEqual([('1 0', 1), ('2 0', 2)], [(o.get('id'), o.object['Version'].value) for o in xml.xpath('//indirect_object')[:2]])
+        self.assertEqual(offsets[2], xml[2][0].span[0])
+        self.assertEqual(second, xml[2][2].value)
+        #A wrong offset fails, multiParser falls back to bruteParser
+        self.assertRaises(Exception, parser.xrefParser, pdf.replace('/Size 3 /Prev %d'%first, '/Size 3 /Prev 11 '))
+        self.assertEqual(3, len(parser.multiParser(pdf.replace('/Size 3 /Prev %d'%first, '/Size 3 /Prev 11 '))))
+
+    def testXrefHybrid(self):
+        import struct
+        pdf = '%PDF-1.5\n'
+        offsets = {}
+        for n in [1, 2, 3, 4]:
+            offsets[n] = len(pdf)
+            pdf += '%d 0 obj\n<< /Version %d >>\nendobj\n'%(n, n)
+        #Object 3 is free in the table, in use in its unfiltered XRefStm
+        stm = len(pdf)
+        data = struct.pack('>BHB', 1, offsets[3], 0)
+        for length in ['4', '9 0 R']:
+            xref = pdf + '5 0 obj\n<< /Type /XRef /Size 6 /Index [3 1] /W [1 2 1] /Length %s >>\nstream\n%s\nendstream\nendobj\n'%(length, data)
+            table = len(xref)
+            xref += 'xref\n0 5\n0000000000 65535 f \n%010d 00000 n \n%010d 00000 n \n0000000000 00001 f \n%010d 00000 n \n'%(offsets[1], offsets[2], offsets[4])
+            xref += 'trailer\n<< /Size 6 /XRefStm %d >>\nstartxref\n%d\n%%%%EOF\n'%(stm, table)
+            xml = parser.xrefParser(xref)
+            self.assertEqual(['1 0', '2 0', '3 0', '4 0', '5 0'], [o.get('id') for o in xml.xpath('//indirect_object')])
+            self.assertEqual(3, xml.getIndirectObject((3,0)).object['Version'].value)
+        #But a free entry in a newer update still deletes the object
+        xref += 'xref\n3 1\n0000000000 00001 f \ntrailer\n<< /Size 6 /Prev %d >>\nstartxref\n%d\n%%%%EOF\n'%(table, len(xref))
+        self.assertEqual(['1 0', '2 0', '4 0', '5 0'], [o.get('id') for o in parser.xrefParser(xref).xpath('//indirect_object')])
+
+    def testXrefStreamPredictor(self):
+        import zlib, struct
+        pdf = '%PDF-1.5\nJUNK ( [ <<\n'
+        offsets = {}
+        for n in [1, 2]:
+            offsets[n] = len(pdf)
+            pdf += '%d 0 obj\n<< /Version %d >>\nendobj\nJUNK >> ]\n'%(n, n)
+        offsets[3] = len(pdf)
+        rows = [struct.pack('>BHB', 0, 0, 255)] + [struct.pack('>BHB', 1, offsets[n], 0) for n in [1, 2, 3]]
+        #PNG Up on every row, as most writers do
+        data, prev = '', '\0'*4
+        for row in rows:
+            data += '\x02' + ''.join([chr((ord(a)-ord(b))%256) for a, b in zip(row, prev)])
+            prev = row
+        for params in ['/DecodeParms << /Predictor 12 /Columns 4 >> ', '']:
+            stream = zlib.compress(data)
+            xref = pdf + '3 0 obj\n<< /Type /XRef /Size 4 /W [1 2 1] /Filter /FlateDecode %s/Length %d >>\nstream\n%s\nendstream\nendobj\n'%(params, len(stream), stream)
+            xref += 'startxref\n%d\n%%%%EOF\n'%offsets[3]
+            if params:
+                self.assertEqual('xref', parser.preScan(xref)['strategy'])
+                xml = parser.xrefParser(xref)
+            else:
+                #Predicted rows left as they are do not fit, fall back to brute
+                self.assertRaises(AssertionError, parser.xrefParser, xref)
+                xml = parser.multiParser(xref)
+            self.assertEqual([('1 0', 1), ('2 0', 2)], [(o.get('id'), o.object['Version'].value) for o in xml.xpath('//indirect_object')[:2]])
+            self.assertEqual(['1 0', '2 0', '3 0'], [o.get('id') for o in xml.xpath('//indirect_object')])
+
+    def testPreScan(self):
+        import os
+        examples = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+        mini = file(os.path.join(examples, 'mini.pdf'), 'rb').read()
+        self.assertEqual('normal', parser.preScan(mini)['strategy'])
+        self.assertEqual('normal', parser.preScan(self.samplePdf(5, 2))['strategy'])
+        #Junk between objects but a sane xref
+        textg = file(os.path.join(examples, 'textg.pdf'), 'rb').read()
+        self.assertEqual('xref', parser.preScan(textg)['strategy'])
+        self.assertEqual('OPAF!(xref)', parser.multiParser(textg).get('version'))
+        #Junk and a broken xref
+        broken = self.samplePdf(5).replace('\n1 0 obj', '\nJUNK\n 1 0 obj')
+        report = parser.preScan(broken)
+        self.assertEqual((False, False, 'brute'), (report['sequential'], report['xref_ok'], report['strategy']))
+        self.assertEqual('OPAF!(raw)', parser.multiParser(broken).get('version'))
+
+    def testRecover(self):
+        pdf = self.samplePdf(6)
+        ids = lambda xml: [o.get('id') for o in xml.xpath('//indirect_object')]
+        third = pdf.index('3 0 obj')
+        fifth = pdf.index('5 0 obj')
+        #A stray byte in object 3, a missing endobj in 4 and a ] in 5
+        bad = pdf[:third+10] + '\x01' + pdf[third+10:fifth-7] + pdf[fifth:fifth+10] + ']' + pdf[fifth+10:]
+        for backend in parser.backends.keys():
+            self.assertRaises(Exception, parser.normalParser, bad, backend)
+            self.assertEqual(parser.normalParser(pdf, backend).xml, parser.normalParser(pdf, backend, recover=True).xml)
+            xml = parser.normalParser(bad, backend, recover=True)
+            self.assertEqual(['1 0', '2 0', '6 0'], ids(xml))
+            third_end = bad.index('endobj', third)+6
+            sixth = bad.index('6 0 obj')
+            self.assertEqual('%d~%d %d~%d %d~%d'%(third, third_end, third_end+1, fifth-6, fifth-6, sixth-1), xml.get('errors'))
+            self.assertEqual(['header', 'pdf_update'], [e.tag for e in xml])
+            self.assertEqual(['indirect_object']*3 + ['xref', 'startxref'], [e.tag for e in xml[1]])
+            self.assertEqual((0, xml[1][-1].span[1]), xml.span)
+            #A cut file keeps all the objects before the cut
+            xml = parser.normalParser(pdf[:fifth+10], backend, recover=True)
+            self.assertEqual(['1 0', '2 0', '3 0', '4 0'], ids(xml))
+            self.assertEqual('%d~%d'%(fifth, fifth+10), xml.get('errors'))
+        #A stray ( eats up to the end of the file, only its object is lost
+        first = pdf.index('1 0 obj')
+        for at, lost in [(third+12, ['3 0']), (third, [])]:
+            bad_string = pdf[:at] + '(' + pdf[at:]
+            xml = parser.normalParser(bad_string, recover=True)
+            self.assertEqual([o for o in ids(parser.normalParser(pdf)) if o not in lost], ids(xml))
+            self.assertEqual([], parser._lostObjects(bad_string, xml))
+            self.assertEqual(ids(xml), ids(parser.multiParser(bad_string)))
+        #From the end of the object before it
+        self.assertEqual('%d~%d'%(xml[1][1].span[1], third+1), xml.get('errors'))
+        #Nothing read before it, all the objects are lost
+        bad_string = pdf[:first] + '(' + pdf[first:]
+        xml = parser.normalParser(bad_string, recover=True)
+        self.assertEqual([], ids(xml))
+        self.assertEqual([m.start()+1 for m in parser._obj_header.finditer(pdf)], parser._lostObjects(bad_string, xml))
+        #The pre scan finds it sequential, no fallback to the brute parser
+        self.assertEqual(['1 0', '2 0', '6 0'], ids(parser.multiParser(bad)))
+        #Same with the parallel parser falling back to the sequential one
+        self.assertEqual(parser.normalParser(bad, recover=True).xml, parser.parallelParser(bad, 2, recover=True).xml)
+        self.assertEqual(parser.multiParser(bad).xml, parser.multiParser(bad, jobs=2).xml)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,68 @@
+import os
+import glob
+import unittest
+from opaflib.lexer import PDFLexer
+from opaflib.scanner import PDFScanner
+from opaflib import parser
+import ply.lex as lex
+
+examples = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+#Differential corpus. Each entry must lex (or fail) the same with both backends
+corpus = [
+    "[", "]", "<<", ">>", "<>", "<01020304>", "< 0102 03 >", "<123>",
+    "(!)", "()", "(st(ri)ng)", "(st(ri)n\\023g)", "(a\\nb\\rc\\td\\be\\ff\\(\\)\\\\)",
+    "(\\0\\01\\377\\456\\7)", "(line\r\nbreaks\rand\nmore)", "(esc\\\r\nnewline)",
+    "(unknown \\x escape)", "(unterminated", "(a(b(c)d)e)",
+    "123.2", "-.002", "+17", "4.", "0", "1.0.1",
+    "/name0", "/", "/a#41#42c", "/a##41", "/a#4", "/#2Fslash/next", "/at_eof",
+    "true false null", "trailer", "endobj", "1 0 obj", "12 0 R", "1 0", "1 0 \nobj",
+    "1 0 obj\n<< /Length 4 >>\nstream\nABCD\nendstream\nendobj\n",
+    "1 0 obj\n<< /Length 4 >>\nstream\r\nAB\r\nendstream\nendobj\n",
+    "%PDF-1.4\n%\xe2\xe3\xcf\xd3\n", "%PDF-1.9\n", "% a comment\n1", "%%EOF", "%%EOF\n",
+    "startxref\n1234\n%%EOF\n", "startxref  \r\n 99",
+    "xref\n0 2\n0000000000 65535 f \n0000000010 00000 n \ntrailer\n<< /Size 2 >>\n",
+    "xref\r\n0 1\r\n0000000000 65535 f\r\n3 1 \r\n0000000020 00001 n\r\ntrailer",
+    "xref\n0 1\n0000000000 65535 f \n\ntrailer",
+    "xref\n0 1\n0000000000 65535 f \n",
+    "qfdgfsda", "<asd>", "asda>", "obj", "endstream",
+    ]
+
+class ScannerTest(unittest.TestCase):
+    def setUp(self):
+        self.ply_lexer = PDFLexer()
+        self.ply_lexer.build(debug=False,errorlog=lex.NullLogger())
+        self.fast_lexer = PDFScanner()
+        self.fast_lexer.build()
+
+    def tearDown(self):
+        self.ply_lexer = None
+        self.fast_lexer = None
+
+    def tokens(self, lexer, data):
+        ''' All the tokens until the end or an error (type, pos) '''
+        toks = []
+        error = None
+        try:
+            for tok in lexer.itertokens(data):
+                toks.append((tok.type, tok.value, tok.lineno, tok.lexpos, getattr(tok, 'endlexpos', None)))
+        except Exception, e:
+            error = (type(e), getattr(e, 'pos', None))
+        return toks, error
+
+    def testCorpus(self):
+        for data in corpus:
+            self.assertEqual(self.tokens(self.ply_lexer, data), self.tokens(self.fast_lexer, data), repr(data))
+
+    def testExamples(self):
+        for filename in glob.glob(os.path.join(examples, '*.pdf')):
+            data = file(filename, 'rb').read()
+            self.assertEqual(self.tokens(self.ply_lexer, data), self.tokens(self.fast_lexer, data), filename)
+
+    def testParse(self):
+        for filename in glob.glob(os.path.join(examples, 'mini.pdf')):
+            data = file(filename, 'rb').read()
+            self.assertEqual(parser.normalParser(data).xml, parser.normalParser(data, backend='fast').xml)
+
+if __name__ == '__main__':
+    unittest.main()